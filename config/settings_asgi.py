@@ -0,0 +1,39 @@
+"""
+ASGI deployment profile for the config project.
+
+Layered on top of ``config.settings_production``: the same caches, sessions
+and nginx setup, served by an ASGI server instead of the WSGI one::
+
+    DJANGO_SETTINGS_MODULE=config.settings_asgi \\
+        uvicorn config.asgi:application --host 127.0.0.1 --port 8000 --workers 4 --lifespan off
+
+or, under gunicorn's process manager::
+
+    DJANGO_SETTINGS_MODULE=config.settings_asgi \\
+        gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker -w 4 -b 127.0.0.1:8000
+
+Django does not implement the ASGI lifespan protocol, hence ``--lifespan off``.
+Compare both paths against the same data with ``manage.py benchmark
+--compare-interfaces`` before switching.
+"""
+
+from copy import deepcopy
+
+from .settings_production import *  # noqa: F401,F403
+from .settings_production import DATABASES as BASE_DATABASES
+
+# The offer list, the intern dashboard and the admin dashboard are served by
+# their async views (see config/urls.py); every other view stays synchronous
+# and runs in Django's thread executor.
+ASYNC_VIEWS = True
+
+# Persistent connections are tied to the thread that opened them and leak
+# under ASGI, where requests do not run on a fixed set of threads. Pool at
+# the database instead (pgbouncer, or OPTIONS['pool'] on PostgreSQL).
+DATABASES = deepcopy(BASE_DATABASES)
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = 0
+
+# Async views render templates on the event loop, where the database cache
+# backend cannot run queries: {% cache %} fragments, the dashboard caches and
+# the cached sessions need memcached or redis here.
@@ -0,0 +1,33 @@
+"""
+Production overrides for the config project.
+
+Layered on top of ``config.settings``; select it with
+DJANGO_SETTINGS_MODULE=config.settings_production.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import MIDDLEWARE as BASE_MIDDLEWARE
+
+DEBUG = False
+
+# CV downloads are authorised by Django and transferred by nginx:
+#
+#     location /protected/ {
+#         internal;
+#         alias /path/to/media/;
+#     }
+#
+# MEDIA_ROOT must not be exposed through any public location.
+SENDFILE_BACKEND = 'x-accel-redirect'
+SENDFILE_URL_PREFIX = '/protected/'
+
+# Per-view timings and query counts, shown to staff at /admin/metrics/.
+# Outermost, so the wall time covers the rest of the middleware stack.
+MIDDLEWARE = ['core.instrumentation.RequestMetricsMiddleware', *BASE_MIDDLEWARE]
+INSTRUMENTATION_LOG = True
+
+# Sessions are read from the cache and only fall back to the database on a
+# miss; the signed-in user and their Intern profile come from the cache too.
+# Both need a cache shared by every process (memcached, redis).
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+AUTHENTICATION_BACKENDS = ['core.backends.ProfileCachingBackend']
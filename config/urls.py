@@ -14,35 +14,43 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from core import views
 from django.contrib.auth import views as auth_views
 from django.contrib.auth.decorators import login_required
-from django.conf import settings
-from django.conf.urls.static import static
 from core.views import CustomLoginView
 
+# Under ASGI (config.settings_asgi) the hot read paths run as native async views.
+if getattr(settings, 'ASYNC_VIEWS', False):
+    offer_list, dashboard, admin_dashboard = views.offer_list_async, views.dashboard_async, views.admin_dashboard_async
+else:
+    offer_list, dashboard, admin_dashboard = views.offer_list, views.dashboard, views.admin_dashboard
+
 urlpatterns = [
     path('', views.home, name='home'),
-    path('admin/', views.admin_dashboard, name='admin_dashboard'),
+    path('admin/', admin_dashboard, name='admin_dashboard'),
     path('admin/applications/', views.admin_application_list, name='admin_application_list'),
+    path('admin/applications/export/', views.admin_application_export, name='admin_application_export'),
+    path('admin/applications/schedule/', views.admin_schedule_interviews, name='admin_schedule_interviews'),
     path('admin/interviews/', views.admin_interviews_list, name='admin_interviews_list'),
+    path('admin/interviews/export/', views.admin_interviews_export, name='admin_interviews_export'),
     path('admin/offers/', views.admin_offers_list, name='admin_offers_list'),
     path('admin/interns/', views.admin_interns_list, name='admin_interns_list'),
+    path('admin/interns/export/', views.admin_interns_export, name='admin_interns_export'),
+    path('admin/metrics/', views.admin_metrics, name='admin_metrics'),
     path('admin/panel/', admin.site.urls),
     path('register/', views.register, name='register'),  
     path('login/', CustomLoginView.as_view(), name='login'),
     path('logout/', auth_views.LogoutView.as_view(next_page='login'), name='logout'),
-    path("offers/", views.offer_list, name="offer_list"),
+    path("offers/", offer_list, name="offer_list"),
     path('offers/apply/<int:offer_id>/', views.apply_offer, name='apply_offer'),
     path('profile/', views.profile, name='profile'),
     path('profile/edit/', login_required(views.edit_profile), name='edit_profile'),
     path('profile/upload-cv/', login_required(views.upload_cv), name='upload_cv'),
-    path('dashboard/', login_required(views.dashboard), name='dashboard'),
+    path('interns/<int:intern_id>/cv/', views.serve_cv, name='serve_cv'),
+    path('dashboard/', login_required(dashboard), name='dashboard'),
     path('password_change/', auth_views.PasswordChangeView.as_view(), name='password_change'),
     path('password_change/done/', auth_views.PasswordChangeDoneView.as_view(), name='password_change_done')
-]
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+]
\ No newline at end of file
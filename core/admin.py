@@ -1,19 +1,28 @@
 from django.contrib import admin
-from .models import InternshipOffer, Intern, InternshipApplication, Interview
+from django.db.models import Count
+from django.utils import timezone
+from .models import ArchivedInterview, InternshipOffer, Intern, InternshipApplication, Interview, OutgoingEmail
 
 from django.utils.html import format_html
-from django.urls import reverse
-from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
-from django.conf import settings
+from django.utils.http import urlencode
 from django.shortcuts import redirect, get_object_or_404
 from django.contrib import messages
-from django.urls import reverse
+from django.urls import reverse, path
+from django.template.response import TemplateResponse
+from .counters import invalidate_dashboard_metrics
+from .forms import InterviewAdminForm, OfferImportForm
+from .matching import application_scores, top_match_scores
+from .offer_import import detect_format, import_offers
+from .transitions import (
+    queue_application_decision_emails, toggle_interviews_archived, transition_applications, transition_interviews,
+)
+
+IMPORT_ERRORS_SHOWN = 200
 
 @admin.register(InternshipOffer)
 class InternshipOfferAdmin(admin.ModelAdmin):
     change_form_template = "admin/core/internshipoffer/change_form.html"
-    list_display = ('title', 'department', 'start_date', 'end_date', 'is_archived', 'application_count', 'view_applications_link')
+    list_display = ('title', 'department', 'start_date', 'end_date', 'is_archived', 'application_count', 'top_match', 'view_applications_link')
     list_filter = ('department', 'is_archived', 'start_date', 'end_date')
     actions = ['archive_selected', 'unarchive_selected']
     date_hierarchy = 'start_date'
@@ -25,23 +34,77 @@ class InternshipOfferAdmin(admin.ModelAdmin):
     
     class Media:
         js = ('js/internship_offer_admin.js',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(applications_total=Count('applications'))
     
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        # Score every applicant of the offers on this page in one batch.
+        scores = top_match_scores([offer.id for offer in changelist.result_list])
+        for offer in changelist.result_list:
+            offer.top_match_score = scores.get(offer.id)
+        return changelist
+
     def application_count(self, obj):
-        return obj.applications.count()
+        return obj.applications_total
     application_count.short_description = 'Applications'
+    application_count.admin_order_field = 'applications_total'
+
+    def top_match(self, obj):
+        score = getattr(obj, 'top_match_score', None)
+        return '-' if score is None else f"{score}%"
+    top_match.short_description = 'Best match'
 
     def view_applications_link(self, obj):
         url = f"{reverse('admin:core_internshipapplication_changelist')}?internship_offer__id__exact={obj.id}"
         return format_html('<a href="{}">View Applications</a>', url)
     view_applications_link.short_description = 'Applications'
 
+    def get_urls(self):
+        urls = [
+            path('import/', self.admin_site.admin_view(self.import_view), name='core_internshipoffer_import'),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            return redirect('admin:core_internshipoffer_changelist')
+
+        result = None
+        form = OfferImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                result = import_offers(upload.file, detect_format(upload.name), dry_run=form.cleaned_data['dry_run'])
+            except ValueError as exc:
+                form.add_error('file', f"Could not read the file: {exc}. No offers were imported.")
+            else:
+                if result.created:
+                    self.message_user(request, f"{result.created} internship offer(s) imported.", messages.SUCCESS)
+                if result.errors:
+                    self.message_user(request, f"{len(result.errors)} row(s) rejected.", messages.WARNING)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import internship offers',
+            'form': form,
+            'result': result,
+            'errors': result.errors[:IMPORT_ERRORS_SHOWN] if result else [],
+            'errors_hidden': max(len(result.errors) - IMPORT_ERRORS_SHOWN, 0) if result else 0,
+        }
+        return TemplateResponse(request, 'admin/core/internshipoffer/import_offers.html', context)
+
     def archive_selected(self, request, queryset):
-        updated = queryset.update(is_archived=True)
+        updated = queryset.update(is_archived=True, updated_at=timezone.now())
+        invalidate_dashboard_metrics()
         self.message_user(request, f"{updated} internship offer(s) archived successfully.")
     archive_selected.short_description = "Archive selected offers"
 
     def unarchive_selected(self, request, queryset):
-        updated = queryset.update(is_archived=False)
+        updated = queryset.update(is_archived=False, updated_at=timezone.now())
+        invalidate_dashboard_metrics()
         self.message_user(request, f"{updated} internship offer(s) unarchived successfully.")
     unarchive_selected.short_description = "Unarchive selected offers"
 
@@ -62,6 +125,10 @@ class InternAdmin(admin.ModelAdmin):
     list_display = ('user', 'get_email', 'cv_link', 'application_count')
     search_fields = ('user__username', 'user__email', 'user__first_name', 'user__last_name')
     list_filter = ('user__is_active',)
+    list_select_related = ('user',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(applications_total=Count('applications'))
     
     def has_add_permission(self, request):
         return False
@@ -76,13 +143,14 @@ class InternAdmin(admin.ModelAdmin):
 
     def cv_link(self, obj):
         if obj.cv:
-            return format_html('<a href="{0}" target="_blank">View CV</a>', obj.cv.url)
+            return format_html('<a href="{0}" target="_blank">View CV</a>', reverse('serve_cv', args=[obj.id]))
         return "No CV"
     cv_link.short_description = 'CV'
 
     def application_count(self, obj):
-        return obj.applications.count()
+        return obj.applications_total
     application_count.short_description = 'Applications'
+    application_count.admin_order_field = 'applications_total'
 
 @admin.register(InternshipApplication)
 class InternshipApplicationAdmin(admin.ModelAdmin):
@@ -93,8 +161,11 @@ class InternshipApplicationAdmin(admin.ModelAdmin):
     list_editable = ('status',)
     actions = ['approve_applications', 'reject_applications', 'schedule_interview']
     date_hierarchy = 'applied_at'
+    list_select_related = ('intern__user', 'internship_offer', 'interview')
 
     def changelist_view(self, request, extra_context=None):
+        if request.method == 'POST' and 'action' in request.POST:
+            return super().changelist_view(request, extra_context)
         return redirect('admin_application_list')
 
     def has_change_permission(self, request, obj=None):
@@ -117,9 +188,11 @@ class InternshipApplicationAdmin(admin.ModelAdmin):
         interview = application.interview if hasattr(application, 'interview') else None
 
         extra_context = extra_context or {}
+        match_score, = application_scores([(application.internship_offer_id, application.intern_id)])
         extra_context.update({
             'application_obj': application,
             'interview': interview,
+            'match_score': match_score,
         })
         return super().change_view(request, object_id, form_url, extra_context)
 
@@ -131,65 +204,22 @@ class InternshipApplicationAdmin(admin.ModelAdmin):
     interview_status.short_description = 'Interview Status'
 
     def approve_applications(self, request, queryset):
-        updated = 0
-        for application in queryset:
-            if application.status != 'approved':
-                application.status = 'approved'
-                application.save()
-
-                if application.intern.user.email:
-                    context = {
-                        'user': application.intern.user,
-                        'offer': application.internship_offer,
-                    }
-
-                    subject = f"Application Approved - {application.internship_offer.title}"
-                    html_body = render_to_string('emails/application_approved.html', context)
-
-                    email = EmailMessage(
-                        subject=subject,
-                        body=html_body,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        to=[application.intern.user.email]
-                    )
-                    email.content_subtype = "html"
-                    email.send(fail_silently=True)
-
-                updated += 1
-
-        self.message_user(request, f"{updated} application(s) approved and notified successfully.")
+        result = transition_applications(queryset, 'approved')
+        queue_application_decision_emails(result)
+        self.message_user(request, f"{len(result)} application(s) approved and notified successfully.")
     approve_applications.short_description = "Approve selected applications"
 
     def reject_applications(self, request, queryset):
-        updated = 0
-        for application in queryset:
-            if application.status != 'refused':
-                application.status = 'refused'
-                application.save()
-
-                if application.intern.user.email:
-                    context = {
-                        'user': application.intern.user,
-                        'offer': application.internship_offer,
-                    }
-
-                    subject = f"Application Not Selected - {application.internship_offer.title}"
-                    html_body = render_to_string('emails/application_rejected.html', context)
-
-                    email = EmailMessage(
-                        subject=subject,
-                        body=html_body,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        to=[application.intern.user.email]
-                    )
-                    email.content_subtype = "html"
-                    email.send(fail_silently=True)
-
-                updated += 1
-
-        self.message_user(request, f"{updated} application(s) rejected and notified successfully.")
+        result = transition_applications(queryset, 'refused')
+        queue_application_decision_emails(result)
+        self.message_user(request, f"{len(result)} application(s) rejected and notified successfully.")
     reject_applications.short_description = "Reject selected applications"
 
+    def schedule_interview(self, request, queryset):
+        ids = queryset.values_list('id', flat=True)
+        return redirect(f"{reverse('admin_schedule_interviews')}?{urlencode({'application_ids': list(ids)}, doseq=True)}")
+    schedule_interview.short_description = "Schedule interviews for selected applications"
+
 @admin.register(Interview)
 class InterviewAdmin(admin.ModelAdmin):
     list_display = ('get_intern', 'get_internship_offer', 'date_time', 'status', 'archived', 'time_until')
@@ -197,23 +227,19 @@ class InterviewAdmin(admin.ModelAdmin):
     search_fields = ('application__intern__user__username', 'application__internship_offer__title')
     list_editable = ('status', 'archived')
     date_hierarchy = 'date_time'
+    list_select_related = ('application__intern__user', 'application__internship_offer')
     actions = ['mark_in_progress', 'mark_completed', 'mark_cancelled', 'mark_no_show', 'toggle_archived']
+    form = InterviewAdminForm
     fieldsets = [
         (None, {
-            'fields': ('application', 'date_time', 'interview_type', 'status', 'zoom_link', 'location', 'notes', 'feedback')
+            'fields': ('application', 'date_time', 'duration_minutes', 'interview_type', 'status', 'zoom_link', 'location', 'notes', 'feedback')
         }),
     ]
     
     def get_form(self, request, obj=None, **kwargs):
         form = super().get_form(request, obj, **kwargs)
         if obj is None:  
-            from .models import InternshipApplication
-            applications_with_interview = set(
-                Interview.objects.values_list('application_id', flat=True)
-            )
-            queryset = InternshipApplication.objects.exclude(
-                id__in=applications_with_interview
-            )
+            queryset = InternshipApplication.objects.filter(interview__isnull=True, archived_interviews__isnull=True)
             
             application_id = request.GET.get('application')
             if application_id:
@@ -255,30 +281,28 @@ class InterviewAdmin(admin.ModelAdmin):
     time_until.short_description = 'Status'
 
     def mark_in_progress(self, request, queryset):
-        updated = queryset.update(status='in_progress')
-        self.message_user(request, f"{updated} interview(s) marked as In Progress.")
+        result = transition_interviews(queryset, 'in_progress')
+        self.message_user(request, f"{len(result)} interview(s) marked as In Progress.")
     mark_in_progress.short_description = "Mark selected as In Progress"
 
     def mark_completed(self, request, queryset):
-        updated = queryset.update(status='completed')
-        self.message_user(request, f"{updated} interview(s) marked as Completed.")
+        result = transition_interviews(queryset, 'completed')
+        self.message_user(request, f"{len(result)} interview(s) marked as Completed.")
     mark_completed.short_description = "Mark selected as Completed"
 
     def mark_cancelled(self, request, queryset):
-        updated = queryset.update(status='cancelled')
-        self.message_user(request, f"{updated} interview(s) marked as Cancelled.")
+        result = transition_interviews(queryset, 'cancelled')
+        self.message_user(request, f"{len(result)} interview(s) marked as Cancelled.")
     mark_cancelled.short_description = "Mark selected as Cancelled"
 
     def mark_no_show(self, request, queryset):
-        updated = queryset.update(status='no_show')
-        self.message_user(request, f"{updated} interview(s) marked as No Show.")
+        result = transition_interviews(queryset, 'no_show')
+        self.message_user(request, f"{len(result)} interview(s) marked as No Show.")
     mark_no_show.short_description = "Mark selected as No Show"
 
     def toggle_archived(self, request, queryset):
-        for obj in queryset:
-            obj.archived = not obj.archived
-            obj.save()
-        self.message_user(request, f"Toggled archive status for {queryset.count()} interview(s).")
+        updated = toggle_interviews_archived(queryset)
+        self.message_user(request, f"Toggled archive status for {updated} interview(s).")
     toggle_archived.short_description = "Toggle archive status"
 
     
@@ -292,4 +316,35 @@ class InterviewAdmin(admin.ModelAdmin):
         if '_save' in request.POST:
              self.message_user(request, "Interview saved successfully.", messages.SUCCESS)   
              return redirect('admin_interviews_list')
-        return super().response_add(request, obj, post_url_continue)
\ No newline at end of file
+        return super().response_add(request, obj, post_url_continue)
+
+
+@admin.register(ArchivedInterview)
+class ArchivedInterviewAdmin(admin.ModelAdmin):
+    list_display = ('interview_id', 'application', 'date_time', 'interview_type', 'status', 'archived_at')
+    list_filter = ('status', 'interview_type')
+    date_hierarchy = 'date_time'
+    list_select_related = ('application__intern__user', 'application__internship_offer')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'to')
+    readonly_fields = ('subject', 'body', 'content_subtype', 'from_email', 'to', 'attempts', 'last_error', 'created_at', 'sent_at')
+    actions = ['retry_selected']
+
+    def has_add_permission(self, request):
+        return False
+
+    def retry_selected(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(status='pending', attempts=0, next_attempt_at=timezone.now())
+        self.message_user(request, f"{updated} email(s) queued for another attempt.")
+    retry_selected.short_description = "Retry selected emails"
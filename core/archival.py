@@ -0,0 +1,111 @@
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import invalidate_dashboard_metrics, invalidate_intern_summaries
+from .models import ArchivedInterview, Interview, InternshipOffer
+
+BATCH_SIZE = 1000
+# Interviews this old are archived unless INTERVIEW_ARCHIVE_AFTER_DAYS says otherwise.
+DEFAULT_INTERVIEW_HORIZON_DAYS = 180
+
+ARCHIVED_INTERVIEW_FIELDS = (
+    'application_id', 'date_time', 'duration_minutes', 'interview_type', 'status',
+    'zoom_link', 'location', 'notes', 'feedback', 'created_at', 'updated_at',
+)
+
+
+@dataclass
+class ArchiveRun:
+    label: str
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def interview_horizon():
+    return timedelta(days=getattr(settings, 'INTERVIEW_ARCHIVE_AFTER_DAYS', DEFAULT_INTERVIEW_HORIZON_DAYS))
+
+
+def stale_offers(today=None):
+    return InternshipOffer.objects.filter(is_archived=False, end_date__lt=today or timezone.localdate())
+
+
+def stale_interviews(now=None):
+    return Interview.objects.filter(archived=False, date_time__lt=(now or timezone.now()) - interview_horizon())
+
+
+def cold_interviews(now=None, include_unarchived=False):
+    """Archived interviews past the horizon, candidates for the archive table."""
+    queryset = Interview.objects.filter(date_time__lt=(now or timezone.now()) - interview_horizon())
+    # A dry run archives nothing, so count what the archive step would flag too.
+    return queryset if include_unarchived else queryset.filter(archived=True)
+
+
+def _batches(queryset, batch_size):
+    # Keyset over the primary key: every batch is one short index range scan
+    # and rows updated by an earlier batch are never read again.
+    last_id = 0
+    while True:
+        ids = list(queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return
+        last_id = ids[-1]
+        yield ids
+
+
+def _run(label, queryset, batch_size, dry_run, apply):
+    run = ArchiveRun(label)
+    started = time.perf_counter()
+    for ids in _batches(queryset, batch_size):
+        if not dry_run:
+            # One short transaction per batch keeps locks brief on a live table.
+            with transaction.atomic():
+                apply(ids)
+                invalidate_dashboard_metrics()
+        run.rows += len(ids)
+        run.batches += 1
+    run.seconds = time.perf_counter() - started
+    return run
+
+
+def archive_offers(batch_size=BATCH_SIZE, dry_run=False, today=None):
+    """Flag offers whose end date has passed as archived."""
+    def apply(ids):
+        InternshipOffer.objects.filter(id__in=ids).update(is_archived=True, updated_at=timezone.now())
+    return _run('offers archived', stale_offers(today), batch_size, dry_run, apply)
+
+
+def archive_interviews(batch_size=BATCH_SIZE, dry_run=False, now=None):
+    """Flag interviews older than the horizon as archived."""
+    def apply(ids):
+        Interview.objects.filter(id__in=ids).update(archived=True, updated_at=timezone.now())
+    return _run('interviews archived', stale_interviews(now), batch_size, dry_run, apply)
+
+
+def move_interviews(batch_size=BATCH_SIZE, dry_run=False, now=None):
+    """Copy archived interviews past the horizon into ArchivedInterview and delete them.
+
+    Offers stay where they are: applications reference them. Their
+    applications keep ``interview`` empty but are not offered for
+    scheduling again (see ``scheduling.unscheduled_applications``).
+    """
+    def apply(ids):
+        rows = list(Interview.objects.filter(id__in=ids).values_list('id', 'application__intern_id', *ARCHIVED_INTERVIEW_FIELDS))
+        ArchivedInterview.objects.bulk_create([
+            ArchivedInterview(interview_id=row[0], **dict(zip(ARCHIVED_INTERVIEW_FIELDS, row[2:])))
+            for row in rows
+        ])
+        # Nothing references an interview, so skip the collector and its
+        # per-row post_delete receivers; the summaries are dropped once here.
+        Interview.objects.filter(id__in=ids)._raw_delete(Interview.objects.db)
+        invalidate_intern_summaries(row[1] for row in rows)
+    return _run('interviews moved to the archive table', cold_interviews(now, dry_run), batch_size, dry_run, apply)
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+
+USER_CACHE_KEY = 'core:auth-user:{}'
+
+# Bounds how long a change that bypassed invalidation (a queryset update(),
+# raw SQL) can go unnoticed, e.g. a deactivated user staying signed in.
+DEFAULT_TIMEOUT = 5 * 60
+
+
+def get_user_cache():
+    return caches[getattr(settings, 'AUTH_USER_CACHE_ALIAS', 'default')]
+
+
+def invalidate_cached_user(user_id):
+    # After commit, like the dashboard caches, so a concurrent request cannot
+    # cache the row as it was before this transaction.
+    key = USER_CACHE_KEY.format(user_id)
+    transaction.on_commit(lambda: get_user_cache().delete(key))
+
+
+class ProfileCachingBackend(ModelBackend):
+    """ModelBackend whose per-request user lookup is served from the cache.
+
+    The user is loaded together with their Intern profile in one joined
+    query and kept for AUTH_USER_CACHE_TIMEOUT seconds (five minutes by
+    default); signals drop the entry whenever the user or the profile is
+    saved or deleted, so password changes and deactivations take effect on
+    the next request. Queryset update() and bulk_update() send no signals:
+    code changing users that way must call invalidate_cached_user() for each
+    of them.
+
+    The cached User includes the password hash (sessions are verified
+    against it), so the cache must not be readable outside the deployment.
+    """
+
+    def get_user(self, user_id):
+        cache = get_user_cache()
+        key = USER_CACHE_KEY.format(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = User._default_manager.select_related('intern').filter(pk=user_id).first()
+            if user is None:
+                return None
+            cache.set(key, user, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', DEFAULT_TIMEOUT))
+        return user if self.user_can_authenticate(user) else None
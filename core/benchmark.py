@@ -0,0 +1,331 @@
+import asyncio
+import json
+import platform
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from importlib import import_module, reload
+
+import django
+from asgiref.sync import ThreadSensitiveContext, async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, clear_url_caches, get_resolver, reverse
+from django.utils import timezone
+
+from .models import Intern, InternshipApplication, InternshipOffer, Interview
+
+DEFAULT_ITERATIONS = 20
+DEFAULT_WARMUP = 2
+# A view regresses when its p95 grows by more than this share of the baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...and by more than this many milliseconds, so sub-millisecond jitter on
+# fast views is not reported.
+DEFAULT_MIN_DELTA_MS = 2.0
+
+# Views with an async version, compared by compare_interfaces().
+HOT_URL_NAMES = ('offer_list', 'dashboard', 'admin_dashboard')
+DEFAULT_REQUESTS = 200
+DEFAULT_CONCURRENCY = 10
+
+# GET on these changes state (logout ends the session, apply_offer applies).
+SKIPPED_URL_NAMES = {'logout', 'apply_offer'}
+
+
+@dataclass
+class ViewResult:
+    path: str
+    status: int
+    queries: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+
+
+@dataclass
+class InterfaceResult:
+    path: str
+    status: int
+    requests: int
+    concurrency: int
+    requests_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _benchmark_intern():
+    # Prefer an intern with a CV so the CV pages do real work.
+    return (
+        Intern.objects.select_related('user')
+        .filter(user__is_active=True, user__is_staff=False)
+        .order_by('-cv', 'id')
+        .first()
+    )
+
+
+def _sample_kwargs():
+    """Values for the URL parameters in config/urls.py, taken from the current data."""
+    intern = _benchmark_intern()
+    return {
+        'offer_id': InternshipOffer.objects.values_list('id', flat=True).first(),
+        'intern_id': intern.id if intern else None,
+        'application_id': InternshipApplication.objects.values_list('id', flat=True).first(),
+        'interview_id': Interview.objects.values_list('id', flat=True).first(),
+    }
+
+
+def discover_urls(only=None):
+    """``[(name, path)]`` for every named project URL outside the Django admin."""
+    samples = _sample_kwargs()
+    urls = []
+    for pattern in get_resolver().url_patterns:
+        # Includes (the Django admin at admin/panel/) are not ours to benchmark.
+        if not isinstance(pattern, URLPattern) or not pattern.name:
+            continue
+        if pattern.name in SKIPPED_URL_NAMES or (only and pattern.name not in only):
+            continue
+        kwargs = {name: samples.get(name) for name in pattern.pattern.converters}
+        if None in kwargs.values():
+            continue
+        urls.append((pattern.name, reverse(pattern.name, kwargs=kwargs)))
+    return urls
+
+
+def benchmark_clients():
+    """A staff client for the admin pages and an intern client for the rest."""
+    staff = User.objects.filter(is_staff=True, is_active=True).order_by('id').first()
+    intern = _benchmark_intern()
+    clients = {}
+    for role, user in (('staff', staff), ('intern', intern.user if intern else None)):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        clients[role] = client
+    return clients
+
+
+def measure(client, path, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP):
+    for _ in range(warmup):
+        client.get(path)
+    timings, queries, status = [], 0, 0
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(path)
+            if response.streaming:
+                # Exports stream their rows; time the whole body.
+                b''.join(response.streaming_content)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, len(captured))
+        status = response.status_code
+    timings.sort()
+    return ViewResult(
+        path=path,
+        status=status,
+        queries=queries,
+        p50_ms=round(_percentile(timings, 0.50), 3),
+        p95_ms=round(_percentile(timings, 0.95), 3),
+        p99_ms=round(_percentile(timings, 0.99), 3),
+        mean_ms=round(statistics.fmean(timings), 3),
+    )
+
+
+def _meta(**options):
+    return {
+        'created_at': timezone.now().isoformat(),
+        **options,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'rows': {
+            'interns': Intern.objects.count(),
+            'offers': InternshipOffer.objects.count(),
+            'applications': InternshipApplication.objects.count(),
+            'interviews': Interview.objects.count(),
+        },
+    }
+
+
+def _client_for(clients, name):
+    return clients['staff' if name.startswith('admin') else 'intern']
+
+
+def run_benchmark(iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, only=None, progress=None):
+    clients = benchmark_clients()
+    results = {}
+    for name, path in discover_urls(only):
+        results[name] = measure(_client_for(clients, name), path, iterations, warmup)
+        if progress:
+            progress(name, results[name])
+    return {
+        'meta': _meta(iterations=iterations),
+        'views': {name: asdict(result) for name, result in results.items()},
+    }
+
+
+@contextmanager
+def serving_async_views(enabled):
+    """Route HOT_URL_NAMES to their async (or sync) views while the block runs."""
+    urlconf = import_module(settings.ROOT_URLCONF)
+    try:
+        with override_settings(ASYNC_VIEWS=enabled):
+            reload(urlconf)
+            clear_url_caches()
+            yield
+    finally:
+        reload(urlconf)
+        clear_url_caches()
+
+
+def _copy_session(client, source):
+    for key, morsel in source.cookies.items():
+        client.cookies[key] = morsel.value
+    return client
+
+
+def _wsgi_requests(source, path, count):
+    client = _copy_session(Client(), source)
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = client.get(path)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        samples.append((response.status_code, (time.perf_counter() - started) * 1000))
+    return samples
+
+
+def _wsgi_worker(source, path, count):
+    try:
+        return _wsgi_requests(source, path, count)
+    finally:
+        # Each worker thread opened its own connection.
+        connection.close()
+
+
+async def _asgi_requests(source, path, count):
+    client = _copy_session(AsyncClient(), source)
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = await client.get(path)
+        if response.streaming:
+            b''.join([chunk async for chunk in response.streaming_content])
+        samples.append((response.status_code, (time.perf_counter() - started) * 1000))
+    return samples
+
+
+async def _asgi_worker(source, path, count):
+    # Sync work gets its own thread (and connection), as under ASGIHandler.
+    async with ThreadSensitiveContext():
+        try:
+            return await _asgi_requests(source, path, count)
+        finally:
+            await sync_to_async(connections.close_all)()
+
+
+async def _asgi_concurrent(source, path, counts):
+    batches = await asyncio.gather(*(_asgi_worker(source, path, count) for count in counts))
+    return [sample for batch in batches for sample in batch]
+
+
+def measure_interface(interface, source, path, requests=DEFAULT_REQUESTS, concurrency=DEFAULT_CONCURRENCY,
+                      warmup=DEFAULT_WARMUP):
+    """Throughput and latency of ``path`` with ``concurrency`` clients in flight.
+
+    'wsgi' goes through Django's WSGI handler, one thread per client, like
+    config/wsgi.py under a threaded server. 'asgi' goes through the ASGI
+    handler, every client a task on one event loop, like config/asgi.py
+    under a single uvicorn worker.
+    """
+    concurrency = max(1, min(concurrency, requests))
+    counts = [requests // concurrency + (1 if number < requests % concurrency else 0) for number in range(concurrency)]
+    if interface == 'asgi':
+        async_to_sync(_asgi_requests)(source, path, warmup)
+        started = time.perf_counter()
+        if concurrency == 1:
+            # Sync work runs in the calling thread, which also sees uncommitted test data.
+            samples = async_to_sync(_asgi_requests)(source, path, requests)
+        else:
+            # Under async_to_sync every request's sync work would be funnelled
+            # back into this one thread.
+            samples = asyncio.run(_asgi_concurrent(source, path, counts))
+    else:
+        _wsgi_requests(source, path, warmup)
+        started = time.perf_counter()
+        if concurrency == 1:
+            samples = _wsgi_requests(source, path, requests)
+        else:
+            with ThreadPoolExecutor(concurrency) as executor:
+                batches = list(executor.map(lambda count: _wsgi_worker(source, path, count), counts))
+            samples = [sample for batch in batches for sample in batch]
+    seconds = time.perf_counter() - started
+
+    timings = sorted(timing for _, timing in samples)
+    return InterfaceResult(
+        path=path,
+        status=samples[-1][0],
+        requests=len(samples),
+        concurrency=concurrency,
+        requests_per_second=round(len(samples) / seconds, 1),
+        p50_ms=round(_percentile(timings, 0.50), 3),
+        p95_ms=round(_percentile(timings, 0.95), 3),
+        p99_ms=round(_percentile(timings, 0.99), 3),
+    )
+
+
+def compare_interfaces(requests=DEFAULT_REQUESTS, concurrency=DEFAULT_CONCURRENCY, warmup=DEFAULT_WARMUP,
+                       only=None, progress=None):
+    """Serve the same URLs through the WSGI path with the sync views and
+    through the ASGI path with the async views, on the same data."""
+    clients = benchmark_clients()
+    urls = discover_urls(only or HOT_URL_NAMES)
+    results = {name: {} for name, _ in urls}
+    for interface in ('wsgi', 'asgi'):
+        with serving_async_views(interface == 'asgi'):
+            for name, path in urls:
+                result = measure_interface(interface, _client_for(clients, name), path, requests, concurrency, warmup)
+                results[name][interface] = asdict(result)
+                if progress:
+                    progress(name, interface, result)
+    return {
+        'meta': _meta(requests=requests, concurrency=concurrency),
+        'views': results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """Messages for every view that got slower or runs more queries than in ``baseline``."""
+    regressions = []
+    for name, result in current['views'].items():
+        before = baseline['views'].get(name)
+        if before is None:
+            continue
+        if result['queries'] > before['queries']:
+            regressions.append(f"{name}: {result['queries']} queries (baseline {before['queries']})")
+        limit = before['p95_ms'] * (1 + threshold)
+        if result['p95_ms'] > limit and result['p95_ms'] - before['p95_ms'] > min_delta_ms:
+            regressions.append(f"{name}: p95 {result['p95_ms']:.1f}ms (baseline {before['p95_ms']:.1f}ms)")
+    return regressions
+
+
+def load(path):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def save(report, path):
+    with open(path, 'w') as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write('\n')
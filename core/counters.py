@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .dashboard import (
+    acompute_dashboard_metrics, arender_intern_summary, compute_dashboard_metrics, render_intern_summary,
+)
+
+DASHBOARD_METRICS_KEY = 'core:dashboard:metrics'
+INTERN_SUMMARY_KEY = 'core:intern-dashboard:{}'
+
+# Upcoming-interview counts depend on the current time, so even without any
+# writes the snapshot has to be refreshed every now and then.
+DEFAULT_TIMEOUT = 60
+
+# Intern summaries are invalidated on every change, the timeout only bounds
+# staleness from writes that bypass the ORM.
+INTERN_SUMMARY_TIMEOUT = 24 * 60 * 60
+
+
+def get_cache():
+    # Any configured cache alias can be used; Django falls back to a local
+    # memory cache when CACHES is not configured. Note that locmem is per
+    # process, so multi-process deployments should point this at a shared
+    # backend (memcached, redis, database) for invalidation to propagate.
+    return caches[getattr(settings, 'DASHBOARD_CACHE_ALIAS', 'default')]
+
+
+def _dashboard_timeout():
+    return getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def _intern_summary_timeout():
+    return getattr(settings, 'INTERN_SUMMARY_CACHE_TIMEOUT', INTERN_SUMMARY_TIMEOUT)
+
+
+def get_dashboard_metrics():
+    cache = get_cache()
+    metrics = cache.get(DASHBOARD_METRICS_KEY)
+    if metrics is None:
+        metrics = compute_dashboard_metrics()
+        cache.set(DASHBOARD_METRICS_KEY, metrics, _dashboard_timeout())
+    return metrics
+
+
+async def aget_dashboard_metrics():
+    cache = get_cache()
+    metrics = await cache.aget(DASHBOARD_METRICS_KEY)
+    if metrics is None:
+        metrics = await acompute_dashboard_metrics()
+        await cache.aset(DASHBOARD_METRICS_KEY, metrics, _dashboard_timeout())
+    return metrics
+
+
+def invalidate_dashboard_metrics():
+    # Deferred until commit so that a concurrent request cannot rebuild the
+    # snapshot from rows that are about to change and cache stale numbers.
+    transaction.on_commit(lambda: get_cache().delete(DASHBOARD_METRICS_KEY))
+
+
+def get_intern_summary(intern_id):
+    cache = get_cache()
+    key = INTERN_SUMMARY_KEY.format(intern_id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = render_intern_summary(intern_id)
+        cache.set(key, summary, _intern_summary_timeout())
+    return summary
+
+
+async def aget_intern_summary(intern_id):
+    cache = get_cache()
+    key = INTERN_SUMMARY_KEY.format(intern_id)
+    summary = await cache.aget(key)
+    if summary is None:
+        summary = await arender_intern_summary(intern_id)
+        await cache.aset(key, summary, _intern_summary_timeout())
+    return summary
+
+
+def invalidate_intern_summaries(intern_ids):
+    keys = [INTERN_SUMMARY_KEY.format(intern_id) for intern_id in set(intern_ids) if intern_id]
+    if keys:
+        transaction.on_commit(lambda: get_cache().delete_many(keys))
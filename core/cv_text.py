@@ -0,0 +1,162 @@
+import hashlib
+import io
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # PDF extraction is optional.
+    PdfReader = None
+
+from django.db.models import F, Q
+
+from .models import CVDocument, Intern
+from .storage import sha256_from_name
+
+# Longer CVs are truncated; recruiters search for skills, not page 40.
+MAX_TEXT_LENGTH = 200_000
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+ODF_TEXT_NS = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+WHITESPACE_RE = re.compile(r'[ \t\r\f\v]+')
+
+
+class UnsupportedFormat(Exception):
+    pass
+
+
+def _pdf_text(data):
+    if PdfReader is None:
+        raise UnsupportedFormat('PDF extraction requires the pypdf package.')
+    reader = PdfReader(io.BytesIO(data))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NS}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{WORD_NS}t')))
+    return '\n'.join(paragraphs)
+
+
+def _odt_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read('content.xml'))
+    return '\n'.join(''.join(node.itertext()) for node in root.iter(f'{ODF_TEXT_NS}p'))
+
+
+def _plain_text(data):
+    return data.decode('utf-8', errors='replace')
+
+
+EXTRACTORS = {
+    'pdf': _pdf_text,
+    'docx': _docx_text,
+    'odt': _odt_text,
+    'txt': _plain_text,
+}
+
+
+def normalize_text(text):
+    lines = (WHITESPACE_RE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)[:MAX_TEXT_LENGTH]
+
+
+def extract_text(data, extension):
+    """Return ``(status, text, error)`` for the file content ``data``."""
+    extractor = EXTRACTORS.get(extension.lower().lstrip('.'))
+    if extractor is None:
+        return 'unsupported', '', f'No text extractor for .{extension} files.'
+    try:
+        text = normalize_text(extractor(data))
+    except UnsupportedFormat as exc:
+        return 'unsupported', '', str(exc)
+    except Exception as exc:
+        return 'failed', '', f'{type(exc).__name__}: {exc}'
+    return ('ok' if text else 'empty'), text, ''
+
+
+def extract_job(job):
+    """Process pool entry point; touches neither the database nor Django storage.
+
+    ``job`` is ``(intern_id, cv_name, sha256, path, data)``; local files are
+    read by the worker, other storages pass the bytes in ``data``.
+    """
+    intern_id, cv_name, sha256, path, data = job
+    try:
+        if data is None:
+            with open(path, 'rb') as handle:
+                data = handle.read()
+    except OSError as exc:
+        return intern_id, cv_name, sha256 or '', 'failed', '', str(exc)
+    if sha256 is None:
+        sha256 = hashlib.sha256(data).hexdigest()
+    status, text, error = extract_text(data, os.path.splitext(cv_name)[1])
+    return intern_id, cv_name, sha256, status, text, error
+
+
+def stale_interns(retry_failed=False):
+    """Interns whose CV changed (or was never extracted) since the last run."""
+    up_to_date = Q(cv_document__cv_name=F('cv'))
+    if retry_failed:
+        up_to_date &= ~Q(cv_document__status='failed')
+    return Intern.objects.exclude(cv='').exclude(up_to_date).order_by('id')
+
+
+def remove_orphaned_documents():
+    return CVDocument.objects.filter(intern__cv='').delete()[0]
+
+
+def plan_batch(interns):
+    """Split ``interns`` into reusable documents, extraction jobs and followers.
+
+    Content-addressed CVs carry their hash in the name, so a CV that was
+    already extracted for another intern is copied instead of re-parsed.
+    """
+    hashes = {intern.id: sha256_from_name(intern.cv.name) for intern in interns}
+    known = {
+        document.sha256: document
+        for document in CVDocument.objects.filter(sha256__in={h for h in hashes.values() if h})
+        .exclude(status='failed')
+        .only('sha256', 'text', 'status', 'error')
+    }
+
+    reused, jobs, followers = [], [], []
+    queued = set()
+    for intern in interns:
+        sha256 = hashes[intern.id]
+        if sha256 in known:
+            source = known[sha256]
+            reused.append(CVDocument(
+                intern_id=intern.id, cv_name=intern.cv.name, sha256=sha256,
+                text=source.text, status=source.status, error=source.error,
+            ))
+        elif sha256 in queued:
+            # Same file as a job earlier in this batch; copy its result.
+            followers.append((intern.id, intern.cv.name, sha256))
+        else:
+            if sha256:
+                queued.add(sha256)
+            jobs.append(_job(intern, sha256))
+    return reused, jobs, followers
+
+
+def _job(intern, sha256):
+    try:
+        return (intern.id, intern.cv.name, sha256, intern.cv.path, None)
+    except NotImplementedError:
+        with intern.cv.open('rb') as handle:
+            return (intern.id, intern.cv.name, sha256, None, handle.read())
+
+
+def save_documents(documents):
+    return CVDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['intern'],
+        update_fields=['cv_name', 'sha256', 'text', 'status', 'error', 'extracted_at'],
+    )
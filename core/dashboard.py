@@ -0,0 +1,227 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import InternshipOffer, Intern, InternshipApplication, Interview
+
+
+@dataclass(frozen=True)
+class ChartSeries:
+    labels: list = field(default_factory=list)
+    data: list = field(default_factory=list)
+
+    def labels_json(self):
+        return json.dumps(self.labels)
+
+    def data_json(self):
+        return json.dumps(self.data)
+
+
+@dataclass(frozen=True)
+class DashboardMetrics:
+    total_applications: int
+    pending_applications: int
+    total_interns: int
+    active_interns: int
+    upcoming_interviews: int
+    interviews_this_week: int
+    total_offers: int
+    active_offers: int
+    applications_by_department: ChartSeries
+    offers_by_department: ChartSeries
+    interviews_by_day: ChartSeries
+    computed_at: datetime
+
+    def as_context(self):
+        return {
+            # Rendered dashboard fragments are cached per snapshot.
+            'metrics_version': int(self.computed_at.timestamp() * 1000),
+            'total_applications': self.total_applications,
+            'pending_applications': self.pending_applications,
+            'active_interns': self.active_interns,
+            'total_interns': self.total_interns,
+            'upcoming_interviews': self.upcoming_interviews,
+            'interviews_this_week': self.interviews_this_week,
+            'active_offers': self.active_offers,
+            'total_offers': self.total_offers,
+            'department_labels': self.applications_by_department.labels_json(),
+            'department_data': self.applications_by_department.data_json(),
+            'offers_department_labels': self.offers_by_department.labels_json(),
+            'offers_department_data': self.offers_by_department.data_json(),
+            'interview_month_labels': self.interviews_by_day.labels_json(),
+            'interview_month_data': self.interviews_by_day.data_json(),
+        }
+
+
+def _department_series(rows, key):
+    return ChartSeries(
+        labels=[row[key] or 'Unknown' for row in rows],
+        data=[row['count'] for row in rows],
+    )
+
+
+def _month_so_far(now):
+    local_now = timezone.localtime(now)
+    start_of_month = local_now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return local_now, start_of_month
+
+
+def _interviews_by_day_rows(now):
+    # One grouped query for the whole month instead of one COUNT per day.
+    local_now, start_of_month = _month_so_far(now)
+    end_of_today = local_now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return (
+        Interview.objects
+        .filter(date_time__gte=start_of_month, date_time__lt=end_of_today)
+        .annotate(day=TruncDate('date_time'))
+        .values('day')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+
+
+def _interviews_by_day(now, rows):
+    local_now, start_of_month = _month_so_far(now)
+    counts = {row['day']: row['count'] for row in rows}
+
+    labels, data = [], []
+    day = start_of_month.date()
+    while day <= local_now.date():
+        labels.append(day.strftime('%m/%d'))
+        data.append(counts.get(day, 0))
+        day += timedelta(days=1)
+    return ChartSeries(labels=labels, data=data)
+
+
+def _kpi_aggregates(now):
+    """``(queryset, aggregates)`` for the KPI cards, one query each."""
+    week_from_now = now + timedelta(days=7)
+    return [
+        (InternshipApplication.objects, {
+            'total': Count('id'),
+            'pending': Count('id', filter=Q(status='pending')),
+            'active_interns': Count('intern', filter=Q(status='approved'), distinct=True),
+        }),
+        (Intern.objects, {'total': Count('id')}),
+        (Interview.objects, {
+            'upcoming': Count('id', filter=Q(date_time__gt=now, date_time__lte=week_from_now)),
+            'this_week': Count('id', filter=Q(date_time__gte=now, date_time__lte=week_from_now)),
+        }),
+        (InternshipOffer.objects, {
+            'total': Count('id'),
+            'active': Count('id', filter=Q(is_archived=False)),
+        }),
+    ]
+
+
+def _chart_querysets(now):
+    applications_by_department = (
+        InternshipApplication.objects
+        .values('internship_offer__department')
+        .annotate(count=Count('id'))
+        .order_by('-count')
+    )
+    offers_by_department = (
+        InternshipOffer.objects
+        .values('department')
+        .annotate(count=Count('id'))
+        .order_by('-count')
+    )
+    return [applications_by_department, offers_by_department, _interviews_by_day_rows(now)]
+
+
+def _dashboard_metrics(now, totals, charts):
+    applications, interns, interviews, offers = totals
+    applications_by_department, offers_by_department, interviews_by_day = charts
+    return DashboardMetrics(
+        total_applications=applications['total'],
+        pending_applications=applications['pending'],
+        total_interns=interns['total'],
+        active_interns=applications['active_interns'],
+        upcoming_interviews=interviews['upcoming'],
+        interviews_this_week=interviews['this_week'],
+        total_offers=offers['total'],
+        active_offers=offers['active'],
+        applications_by_department=_department_series(applications_by_department, 'internship_offer__department'),
+        offers_by_department=_department_series(offers_by_department, 'department'),
+        interviews_by_day=_interviews_by_day(now, interviews_by_day),
+        computed_at=now,
+    )
+
+
+def compute_dashboard_metrics(now=None):
+    """Compute every admin dashboard KPI and chart series.
+
+    The number of queries is fixed regardless of how many rows, departments
+    or days are involved.
+    """
+    now = now or timezone.now()
+    totals = [queryset.aggregate(**aggregates) for queryset, aggregates in _kpi_aggregates(now)]
+    charts = [list(queryset) for queryset in _chart_querysets(now)]
+    return _dashboard_metrics(now, totals, charts)
+
+
+async def alist(queryset):
+    return [row async for row in queryset]
+
+
+async def acompute_dashboard_metrics(now=None):
+    """compute_dashboard_metrics for async views.
+
+    The queries are independent of each other and are awaited together
+    rather than one after another.
+    """
+    now = now or timezone.now()
+    results = await asyncio.gather(
+        *(queryset.aaggregate(**aggregates) for queryset, aggregates in _kpi_aggregates(now)),
+        *(alist(queryset) for queryset in _chart_querysets(now)),
+    )
+    return _dashboard_metrics(now, results[:4], results[4:])
+
+
+@dataclass(frozen=True)
+class InternSummary:
+    stats_html: str
+    applications_html: str
+
+
+INTERN_SUMMARY_COUNTS = {
+    'total': Count('id'),
+    'pending': Count('id', filter=Q(status='pending')),
+    'approved': Count('id', filter=Q(status='approved')),
+    'refused': Count('id', filter=Q(status='refused')),
+}
+
+
+def _intern_applications(intern_id):
+    return InternshipApplication.objects.filter(intern_id=intern_id)
+
+
+def _render_summary(context):
+    return InternSummary(
+        stats_html=render_to_string('intern/partials/application_stats.html', context),
+        applications_html=render_to_string('intern/partials/application_list.html', context),
+    )
+
+
+def render_intern_summary(intern_id):
+    """Render the status cards and application list of an intern's dashboard."""
+    applications = _intern_applications(intern_id)
+    context = applications.aggregate(**INTERN_SUMMARY_COUNTS)
+    if context['total']:
+        context['applications'] = applications.select_related('internship_offer').order_by('-applied_at')
+    return _render_summary(context)
+
+
+async def arender_intern_summary(intern_id):
+    applications = _intern_applications(intern_id)
+    context = await applications.aaggregate(**INTERN_SUMMARY_COUNTS)
+    if context['total']:
+        context['applications'] = await alist(applications.select_related('internship_offer').order_by('-applied_at'))
+    return _render_summary(context)
@@ -1,17 +1,66 @@
 from django.shortcuts import redirect
 from django.contrib import messages
+from django.core.exceptions import ObjectDoesNotExist
 from functools import wraps
 
+from asgiref.sync import iscoroutinefunction
+
+from .models import Intern
+
+def _refuse(request, user):
+    if not user.is_authenticated:
+        messages.warning(request, "Please log in to access this page.")
+        return redirect('login')
+
+    if user.is_staff or user.is_superuser:
+        messages.error(request, "Admin have not access to this page.")
+        return redirect(request.META.get('HTTP_REFERER', '/'))
+    return None
+
 def intern_required(view_func):
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _wrapped_async_view(request, *args, **kwargs):
+            response = _refuse(request, await aload_user(request))
+            if response is not None:
+                return response
+            return await view_func(request, *args, **kwargs)
+        return _wrapped_async_view
+
     @wraps(view_func)
     def _wrapped_view(request, *args, **kwargs):
-        if not request.user.is_authenticated:
-            messages.warning(request, "Please log in to access this page.")
-            return redirect('login')
-            
-        if request.user.is_staff or request.user.is_superuser:
-            messages.error(request, "Admin have not access to this page.")
-            return redirect(request.META.get('HTTP_REFERER', '/'))
-            
+        response = _refuse(request, request.user)
+        if response is not None:
+            return response
         return view_func(request, *args, **kwargs)
     return _wrapped_view
+
+async def aload_user(request):
+    """Resolve request.user without blocking, for async views.
+
+    request.user is lazy and would query from the event loop the first time
+    a template touches it; after this it holds the loaded user.
+    """
+    request.user = await request.auser()
+    return request.user
+
+def get_request_intern(request):
+    """The signed-in user's Intern profile; the caching auth backend loads it with the user."""
+    try:
+        return request.user.intern
+    except ObjectDoesNotExist:
+        # Accounts created as staff and later demoted have no profile yet.
+        intern, _ = Intern.objects.get_or_create(user=request.user)
+        return intern
+
+async def aget_request_intern(request):
+    user = await aload_user(request)
+    # Only read the relation when the caching backend preloaded it; a lazy
+    # lookup would run a blocking query on the event loop.
+    if type(user).intern.is_cached(user):
+        try:
+            return user.intern
+        except ObjectDoesNotExist:
+            pass
+    intern, _ = await Intern.objects.aget_or_create(user=user)
+    return intern
@@ -0,0 +1,246 @@
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import InternshipApplication, Interview
+
+CHUNK_SIZE = 2000
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+APPLICATION_STATUSES = dict(InternshipApplication.STATUS_CHOICES)
+INTERVIEW_STATUSES = dict(Interview.STATUS_CHOICES)
+INTERVIEW_TYPES = dict(Interview.INTERVIEW_TYPES)
+
+# (header, values_list field, formatter)
+APPLICATION_COLUMNS = [
+    ('ID', 'id', None),
+    ('Username', 'intern__user__username', None),
+    ('First name', 'intern__user__first_name', None),
+    ('Last name', 'intern__user__last_name', None),
+    ('Email', 'intern__user__email', None),
+    ('Offer', 'internship_offer__title', None),
+    ('Department', 'internship_offer__department', None),
+    ('Status', 'status', APPLICATION_STATUSES.get),
+    ('Applied at', 'applied_at', None),
+]
+
+INTERVIEW_COLUMNS = [
+    ('ID', 'id', None),
+    ('Username', 'application__intern__user__username', None),
+    ('Email', 'application__intern__user__email', None),
+    ('Offer', 'application__internship_offer__title', None),
+    ('Department', 'application__internship_offer__department', None),
+    ('Date', 'date_time', None),
+    ('Type', 'interview_type', INTERVIEW_TYPES.get),
+    ('Status', 'status', INTERVIEW_STATUSES.get),
+    ('Location', 'location', None),
+    ('Zoom link', 'zoom_link', None),
+    ('Archived', 'archived', None),
+]
+
+INTERN_COLUMNS = [
+    ('ID', 'id', None),
+    ('Username', 'user__username', None),
+    ('First name', 'user__first_name', None),
+    ('Last name', 'user__last_name', None),
+    ('Email', 'user__email', None),
+    ('CV', 'cv', None),
+    ('Joined', 'user__date_joined', None),
+]
+
+ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def filter_applications(queryset, status='', department=''):
+    """Apply the admin application list filters; returns the queryset and the accepted status."""
+    status = (status or '').lower()
+    if status not in APPLICATION_STATUSES:
+        status = ''
+    if status:
+        queryset = queryset.filter(status=status)
+    if department:
+        queryset = queryset.filter(internship_offer__department=department)
+    return queryset, status
+
+
+def filter_interviews(queryset, status=''):
+    if status:
+        queryset = queryset.filter(status=status)
+    return queryset
+
+
+def filter_offers(queryset, archived=''):
+    return queryset.filter(is_archived=bool(archived))
+
+
+def filter_interns(queryset, cv_status=''):
+    if cv_status == 'has_cv':
+        queryset = queryset.exclude(cv='')
+    elif cv_status == 'no_cv':
+        queryset = queryset.filter(cv='')
+    return queryset
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def export_rows(queryset, columns):
+    """Yield formatted rows, streaming from the database in chunks."""
+    fields = [field for _, field, _ in columns]
+    formatters = [formatter for _, _, formatter in columns]
+    for row in queryset.values_list(*fields).iterator(chunk_size=CHUNK_SIZE):
+        yield [
+            _cell(formatter(value, value) if formatter else value)
+            for value, formatter in zip(row, formatters)
+        ]
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _csv_safe(value):
+    # Keep spreadsheet applications from evaluating user-provided text.
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@'):
+        return "'" + value
+    return value
+
+
+def iter_csv(header, rows):
+    writer = csv.writer(_Echo())
+    yield '\ufeff' + writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([_csv_safe(value) for value in row])
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only, unseekable sink so zipfile streams entries with data descriptors."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_cell(value):
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c><v>{value}</v></c>'
+    text = escape(ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return ('<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>').encode()
+
+
+def iter_xlsx(header, rows, flush_every=500):
+    """Stream a single-sheet XLSX workbook without building it in memory."""
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        yield buffer.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(header))
+            for count, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row))
+                if count % flush_every == 0:
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            sheet.write(b'</sheetData></worksheet>')
+    yield buffer.drain()
+
+
+def iter_export(export_format, columns, rows):
+    header = [title for title, _, _ in columns]
+    if export_format == 'xlsx':
+        return iter_xlsx(header, rows)
+    return (line.encode('utf-8') for line in iter_csv(header, rows))
+
+
+def export_response(queryset, columns, filename, export_format='csv'):
+    if export_format not in FORMATS:
+        export_format = 'csv'
+    response = StreamingHttpResponse(
+        iter_export(export_format, columns, export_rows(queryset, columns)),
+        content_type=FORMATS[export_format],
+    )
+    stamp = timezone.localtime().strftime('%Y%m%d-%H%M')
+    response['Content-Disposition'] = f'attachment; filename="{filename}-{stamp}.{export_format}"'
+    return response
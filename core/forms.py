@@ -1,7 +1,13 @@
+from datetime import datetime, timedelta
+
 from django import forms
+from django.core.validators import URLValidator
+from django.utils import timezone
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
-from .models import Intern
+from .models import DEFAULT_INTERVIEW_MINUTES, MAX_INTERVIEW_MINUTES, Intern, Interview
+from .scheduling import BLOCKING_STATUSES, Slot, find_conflicts, working_hours
+from .storage import CV_EXTENSIONS
 
 class CustomUserCreationForm(UserCreationForm):
     email = forms.EmailField(required=True)
@@ -39,3 +45,98 @@ class CVUploadForm(forms.ModelForm):
     class Meta:
         model = Intern
         fields = ['cv']
+        widgets = {
+            'cv': forms.ClearableFileInput(attrs={'accept': ','.join(f'.{ext}' for ext in CV_EXTENSIONS)}),
+        }
+
+class OfferImportForm(forms.Form):
+    file = forms.FileField(help_text='CSV, JSON or JSON Lines with title, description, department, duration, requirements, start_date and end_date columns.')
+    dry_run = forms.BooleanField(required=False, help_text='Only validate the file.')
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(('.csv', '.json', '.jsonl')):
+            raise forms.ValidationError('Upload a .csv, .json or .jsonl file.')
+        return upload
+
+class InterviewAdminForm(forms.ModelForm):
+    class Meta:
+        model = Interview
+        fields = '__all__'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        application = cleaned_data.get('application')
+        start = cleaned_data.get('date_time')
+        minutes = cleaned_data.get('duration_minutes')
+        if start and minutes and cleaned_data.get('status') in BLOCKING_STATUSES:
+            # Without an application only the room can clash.
+            conflicts = find_conflicts(
+                cleaned_data.get('interview_type'), cleaned_data.get('location'), cleaned_data.get('zoom_link'),
+                application.intern_id if application else None, start, minutes, exclude=self.instance.pk,
+            )
+            for message in conflicts:
+                self.add_error('date_time', message)
+        return cleaned_data
+
+class InterviewScheduleForm(forms.Form):
+    windows = forms.CharField(
+        widget=forms.Textarea(attrs={'rows': 4, 'class': 'form-control', 'placeholder': '2025-06-02 09:00-12:00\n2025-06-03'}),
+        help_text='One window per line: "YYYY-MM-DD HH:MM-HH:MM", or a date alone for the whole working day.',
+    )
+    duration_minutes = forms.IntegerField(
+        min_value=5, max_value=MAX_INTERVIEW_MINUTES, initial=DEFAULT_INTERVIEW_MINUTES,
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+    )
+    interview_type = forms.ChoiceField(choices=Interview.INTERVIEW_TYPES, widget=forms.Select(attrs={'class': 'form-select'}))
+    rooms = forms.CharField(
+        widget=forms.Textarea(attrs={'rows': 3, 'class': 'form-control'}),
+        help_text='One location (in person) or Zoom link per line; interviews run in parallel across them.',
+    )
+
+    def clean_windows(self):
+        windows = []
+        day_start, day_end = working_hours()
+        for line in self.cleaned_data['windows'].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            day, _, hours = line.partition(' ')
+            try:
+                date = datetime.strptime(day, '%Y-%m-%d').date()
+                if hours:
+                    opens, closes = (datetime.strptime(part.strip(), '%H:%M').time() for part in hours.split('-'))
+                else:
+                    opens, closes = day_start, day_end
+            except ValueError:
+                raise forms.ValidationError(f'Could not read the window "{line}".')
+            start = timezone.make_aware(datetime.combine(date, opens))
+            end = timezone.make_aware(datetime.combine(date, closes))
+            if end <= start:
+                raise forms.ValidationError(f'The window "{line}" ends before it starts.')
+            # Only the part of a window that is still ahead can be booked.
+            start = max(start, timezone.now())
+            if end > start:
+                windows.append(Slot(start, end))
+        if not windows:
+            raise forms.ValidationError('Enter at least one window in the future.')
+        return sorted(windows)
+
+    def clean_rooms(self):
+        return list(dict.fromkeys(line.strip() for line in self.cleaned_data['rooms'].splitlines() if line.strip()))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        rooms = cleaned_data.get('rooms')
+        if rooms is not None and cleaned_data.get('interview_type') == 'zoom':
+            validate_url = URLValidator()
+            for room in rooms:
+                try:
+                    validate_url(room)
+                except forms.ValidationError:
+                    self.add_error('rooms', f'"{room}" is not a valid Zoom link.')
+        windows = cleaned_data.get('windows')
+        minutes = cleaned_data.get('duration_minutes')
+        if windows and minutes and all(window.end - window.start < timedelta(minutes=minutes) for window in windows):
+            self.add_error('windows', 'No window is long enough for one interview.')
+        return cleaned_data
@@ -0,0 +1,221 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from contextlib import ExitStack, asynccontextmanager
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template as DjangoTemplate
+
+logger = logging.getLogger(__name__)
+
+# Samples kept per view; older ones roll off.
+WINDOW_SIZE = 1000
+# Upper bounds, in milliseconds, of the latency histogram buckets.
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_current = ContextVar('request_metrics', default=None)
+_samples = {}
+_samples_lock = threading.Lock()
+_template_hook_lock = threading.Lock()
+_template_hook_installed = False
+
+
+@dataclass
+class RequestMetrics:
+    wall_ms: float = 0.0
+    queries: int = 0
+    sql_ms: float = 0.0
+    template_ms: float = 0.0
+    response_bytes: int = 0
+    status: int = 0
+    # Nested top-level renders (render_to_string inside a template tag)
+    # are already counted by the outer render.
+    template_depth: int = 0
+
+
+def _sql_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if metrics is not None:
+            metrics.queries += 1
+            metrics.sql_ms += (time.perf_counter() - started) * 1000
+
+
+def wrap_queries(wrapper, aliases=None):
+    """Install ``wrapper`` on the calling thread's connections until the returned stack is closed."""
+    stack = ExitStack()
+    for alias in aliases or connections:
+        stack.enter_context(connections[alias].execute_wrapper(wrapper))
+    return stack
+
+
+@asynccontextmanager
+async def awrap_queries(wrapper, aliases=None):
+    # The async ORM runs its queries in the request's sync thread, on that
+    # thread's connections; the event loop's connection objects never see them.
+    stack = await sync_to_async(wrap_queries)(wrapper, aliases)
+    try:
+        yield
+    finally:
+        await sync_to_async(stack.close)()
+
+
+def _install_template_hook():
+    # Django has no render hook outside the test runner, so the backend's
+    # Template.render (one call per render()/render_to_string()) is wrapped.
+    global _template_hook_installed
+    with _template_hook_lock:
+        if _template_hook_installed:
+            return
+        original = DjangoTemplate.render
+
+        def render(self, context=None, request=None):
+            metrics = _current.get()
+            if metrics is None or metrics.template_depth:
+                return original(self, context, request)
+            metrics.template_depth += 1
+            started = time.perf_counter()
+            try:
+                return original(self, context, request)
+            finally:
+                metrics.template_depth -= 1
+                metrics.template_ms += (time.perf_counter() - started) * 1000
+
+        DjangoTemplate.render = render
+        _template_hook_installed = True
+
+
+def record(view_name, metrics):
+    samples = _samples.get(view_name)
+    if samples is None:
+        with _samples_lock:
+            samples = _samples.setdefault(view_name, deque(maxlen=WINDOW_SIZE))
+    samples.append((metrics.wall_ms, metrics.queries, metrics.sql_ms, metrics.template_ms, metrics.response_bytes))
+
+
+def reset():
+    with _samples_lock:
+        _samples.clear()
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summary():
+    """Per-view aggregates over the rolling window, slowest p95 first."""
+    with _samples_lock:
+        snapshot = {view: list(samples) for view, samples in _samples.items()}
+
+    rows = []
+    for view, samples in snapshot.items():
+        walls = sorted(sample[0] for sample in samples)
+        count = len(samples)
+        histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for wall in walls:
+            bucket = 0
+            while bucket < len(LATENCY_BUCKETS_MS) and wall > LATENCY_BUCKETS_MS[bucket]:
+                bucket += 1
+            histogram[bucket] += 1
+        rows.append({
+            'view': view,
+            'count': count,
+            'p50_ms': round(_percentile(walls, 0.50), 2),
+            'p95_ms': round(_percentile(walls, 0.95), 2),
+            'p99_ms': round(_percentile(walls, 0.99), 2),
+            'max_ms': round(walls[-1], 2),
+            'avg_queries': round(sum(sample[1] for sample in samples) / count, 1),
+            'max_queries': max(sample[1] for sample in samples),
+            'avg_sql_ms': round(sum(sample[2] for sample in samples) / count, 2),
+            'avg_template_ms': round(sum(sample[3] for sample in samples) / count, 2),
+            'avg_bytes': round(sum(sample[4] for sample in samples) / count),
+            'histogram': histogram,
+        })
+    return sorted(rows, key=lambda row: -row['p95_ms'])
+
+
+def _response_size(response):
+    if response.streaming:
+        return int(response.get('Content-Length') or 0)
+    return len(response.content)
+
+
+class RequestMetricsMiddleware:
+    """Time every request per view: wall, SQL and template time, query count and size.
+
+    Samples go to an in-process rolling window shown at /admin/metrics/ and,
+    with INSTRUMENTATION_LOG = True, to the ``core.instrumentation`` logger
+    as one JSON line per request. Disable with INSTRUMENTATION_ENABLED = False.
+    Works under WSGI and ASGI; async views are not pushed through a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.log = getattr(settings, 'INSTRUMENTATION_LOG', False)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        _install_template_hook()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with wrap_queries(_sql_wrapper):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics, started)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            async with awrap_queries(_sql_wrapper):
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics, started)
+        return response
+
+    def finish(self, request, response, metrics, started):
+        metrics.wall_ms = (time.perf_counter() - started) * 1000
+        metrics.status = response.status_code
+        metrics.response_bytes = _response_size(response)
+
+        match = request.resolver_match
+        view_name = match.view_name if match else '<unresolved>'
+        record(view_name, metrics)
+        if self.log:
+            logger.info(json.dumps({
+                'view': view_name,
+                'method': request.method,
+                'status': metrics.status,
+                'wall_ms': round(metrics.wall_ms, 2),
+                'queries': metrics.queries,
+                'sql_ms': round(metrics.sql_ms, 2),
+                'template_ms': round(metrics.template_ms, 2),
+                'bytes': metrics.response_bytes,
+            }))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from core.archival import BATCH_SIZE, archive_interviews, archive_offers, interview_horizon, move_interviews
+
+
+class Command(BaseCommand):
+    help = 'Archive offers past their end date and interviews older than the retention horizon (supports --dry-run)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Rows updated per transaction.'
+        )
+        parser.add_argument(
+            '--move',
+            action='store_true',
+            help='Also move archived interviews past the horizon into the archive table.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the rows that would be archived without changing anything.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size, dry_run = options['batch_size'], options['dry_run']
+        self.stdout.write(f'Interview horizon: {interview_horizon().days} day(s).')
+
+        runs = [
+            archive_offers(batch_size, dry_run),
+            archive_interviews(batch_size, dry_run),
+        ]
+        if options['move']:
+            runs.append(move_interviews(batch_size, dry_run))
+
+        prefix = 'Would be ' if dry_run else ''
+        for run in runs:
+            self.stdout.write(self.style.SUCCESS(
+                f'{prefix}{run.label}: {run.rows} in {run.batches} batch(es), '
+                f'{run.seconds:.2f}s ({run.rate:.0f} rows/s)'
+            ))
@@ -0,0 +1,106 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.benchmark import (
+    DEFAULT_CONCURRENCY, DEFAULT_ITERATIONS, DEFAULT_MIN_DELTA_MS, DEFAULT_REQUESTS, DEFAULT_THRESHOLD, DEFAULT_WARMUP,
+    HOT_URL_NAMES, compare, compare_interfaces, load, run_benchmark, save,
+)
+
+
+class Command(BaseCommand):
+    help = 'Time every project URL through the test client and compare against a JSON baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=DEFAULT_ITERATIONS,
+            help='Timed requests per URL.'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=DEFAULT_WARMUP,
+            help='Untimed requests per URL before measuring.'
+        )
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            help='URL names to benchmark (default: all).'
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results as JSON to this file, e.g. to record a new baseline.'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='JSON file from an earlier --output run; fail when a view regresses against it.'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help='Allowed relative p95 slowdown before a view counts as regressed.'
+        )
+        parser.add_argument(
+            '--min-delta-ms',
+            type=float,
+            default=DEFAULT_MIN_DELTA_MS,
+            help='Ignore p95 slowdowns smaller than this many milliseconds.'
+        )
+        parser.add_argument(
+            '--compare-interfaces',
+            action='store_true',
+            help=f'Serve the URLs (default: {", ".join(HOT_URL_NAMES)}) through the WSGI handler with the sync '
+                 'views and through the ASGI handler with the async views, and report both.'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=DEFAULT_REQUESTS,
+            help='Timed requests per URL and interface with --compare-interfaces.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help='Requests in flight at once with --compare-interfaces.'
+        )
+
+    def handle(self, *args, **options):
+        def progress(name, result):
+            self.stdout.write(
+                f'{name:32} {result.status}  p50 {result.p50_ms:8.2f}ms  p95 {result.p95_ms:8.2f}ms  '
+                f'{result.queries:3} queries'
+            )
+
+        def interface_progress(name, interface, result):
+            self.stdout.write(
+                f'{name:24} {interface}  {result.status}  {result.requests_per_second:8.1f} req/s  '
+                f'p50 {result.p50_ms:8.2f}ms  p95 {result.p95_ms:8.2f}ms'
+            )
+
+        if options['compare_interfaces'] and options['baseline']:
+            raise CommandError('--baseline cannot be combined with --compare-interfaces.')
+
+        # Lets the test client through ALLOWED_HOSTS and keeps emails in memory.
+        setup_test_environment()
+        try:
+            if options['compare_interfaces']:
+                report = compare_interfaces(
+                    options['requests'], options['concurrency'], options['warmup'], options['only'], interface_progress
+                )
+            else:
+                report = run_benchmark(options['iterations'], options['warmup'], options['only'], progress)
+        finally:
+            teardown_test_environment()
+
+        if options['output']:
+            save(report, options['output'])
+            self.stdout.write(f"Results written to {options['output']}.")
+
+        if options['baseline']:
+            regressions = compare(load(options['baseline']), report, options['threshold'], options['min_delta_ms'])
+            if regressions:
+                raise CommandError('Performance regressions:\n  ' + '\n  '.join(regressions))
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from core.exports import filter_applications, filter_interviews, filter_offers
+from core.models import InternshipOffer, Interview
+from core.pagination import CursorPaginator
+from core.views import (
+    ADMIN_APPLICATION_PAGING, ADMIN_INTERN_PAGING, ADMIN_INTERVIEW_PAGING, ADMIN_OFFER_PAGING, OFFER_LIST_PAGING,
+    admin_applications, admin_dashboard_tables, admin_interns, admin_interviews, offer_facets, offer_filters,
+)
+
+
+def first_page(queryset, paging):
+    return CursorPaginator(queryset, *paging).first_page_queryset()
+
+
+def hot_queries():
+    """The querysets behind the busiest views, built with the views' own helpers."""
+    now = timezone.now()
+    sample_department = (
+        InternshipOffer.objects.values_list('department', flat=True).first() or 'IT'
+    )
+    department_facets, duration_facets = offer_facets()
+    recent_applications, upcoming_interviews = admin_dashboard_tables(now)
+
+    return [
+        ('offer_list: offers by start date',
+         first_page(offer_filters({})[0], OFFER_LIST_PAGING)),
+        ('offer_list: department filter',
+         first_page(offer_filters({'department': sample_department})[0], OFFER_LIST_PAGING)),
+        ('offer_list: department facet', department_facets),
+        ('offer_list: duration facet', duration_facets),
+        ('admin_offers_list: active offers',
+         first_page(filter_offers(InternshipOffer.objects.all()), ADMIN_OFFER_PAGING)),
+        ('admin_application_list: newest applications',
+         first_page(filter_applications(admin_applications())[0], ADMIN_APPLICATION_PAGING)),
+        ('admin_application_list: status filter',
+         first_page(filter_applications(admin_applications(), 'pending')[0], ADMIN_APPLICATION_PAGING)),
+        ('admin_application_list: department filter',
+         first_page(filter_applications(admin_applications(), '', sample_department)[0], ADMIN_APPLICATION_PAGING)),
+        ('admin_interviews_list: latest interviews',
+         first_page(filter_interviews(admin_interviews()), ADMIN_INTERVIEW_PAGING)),
+        ('admin_interviews_list: status filter',
+         first_page(filter_interviews(admin_interviews(), 'scheduled'), ADMIN_INTERVIEW_PAGING)),
+        ('admin_dashboard: recent applications', recent_applications),
+        ('admin_dashboard: upcoming interviews', upcoming_interviews),
+        ('admin_dashboard: interviews this week',
+         Interview.objects.filter(date_time__gte=now, date_time__lte=now + timedelta(days=7))),
+        ('admin_interns_list: newest interns',
+         first_page(admin_interns(), ADMIN_INTERN_PAGING)),
+    ]
+
+
+def full_scans(plan):
+    """Return the plan lines that read a whole table instead of an index."""
+    lines = []
+    for line in plan.splitlines():
+        stripped = line.strip()
+        if connection.vendor == 'postgresql' and 'Seq Scan' in stripped:
+            lines.append(stripped)
+        elif connection.vendor == 'sqlite' and 'SCAN ' in stripped and 'USING' not in stripped:
+            lines.append(stripped)
+    return lines
+
+
+class Command(BaseCommand):
+    help = 'Print EXPLAIN plans for the hot view queries and flag full table scans (supports --fail-on-scan)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fail-on-scan',
+            action='store_true',
+            help='Exit with an error when any plan contains a full table scan.'
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run EXPLAIN ANALYZE where the database supports it (executes the queries).'
+        )
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options['analyze'] and connection.vendor == 'postgresql':
+            explain_options['analyze'] = True
+
+        flagged = []
+        for label, queryset in hot_queries():
+            plan = queryset.explain(**explain_options)
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(plan)
+
+            scans = full_scans(plan)
+            if scans:
+                flagged.append(label)
+                for line in scans:
+                    self.stdout.write(self.style.WARNING(f'  full scan: {line}'))
+            self.stdout.write('')
+
+        if not flagged:
+            self.stdout.write(self.style.SUCCESS('No full table scans in the hot queries.'))
+            return
+
+        message = f'{len(flagged)} hot query plan(s) contain full table scans.'
+        if options['fail_on_scan']:
+            raise CommandError(message)
+        self.stdout.write(self.style.WARNING(message))
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import APPLICATION_COLUMNS, FORMATS, export_rows, filter_applications, iter_export
+from core.models import InternshipApplication
+
+
+class Command(BaseCommand):
+    help = 'Stream internship applications to CSV or XLSX without loading them into memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=sorted(FORMATS),
+            default='csv',
+            help='Output format.'
+        )
+        parser.add_argument(
+            '--status',
+            default='',
+            help='Only export applications with this status.'
+        )
+        parser.add_argument(
+            '--department',
+            default='',
+            help='Only export applications for offers in this department.'
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write to (defaults to stdout).'
+        )
+
+    def handle(self, *args, **options):
+        queryset, _ = filter_applications(
+            InternshipApplication.objects.all(),
+            options['status'],
+            options['department'],
+        )
+        rows = export_rows(queryset.order_by('-applied_at', '-id'), APPLICATION_COLUMNS)
+        chunks = iter_export(options['format'], APPLICATION_COLUMNS, rows)
+
+        if not options['output']:
+            # Through self.stdout, so call_command(..., stdout=...) captures it.
+            binary = getattr(self.stdout, 'buffer', None)
+            if binary is None and options['format'] != 'csv':
+                raise CommandError('This stdout only accepts text; use --output for XLSX.')
+            for chunk in chunks:
+                if binary is None:
+                    self.stdout.write(chunk.decode('utf-8'), ending='')
+                else:
+                    binary.write(chunk)
+            self.stdout.flush()
+            return
+
+        with open(options['output'], 'wb') as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Exported applications to {options['output']}"))
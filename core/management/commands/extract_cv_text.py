@@ -0,0 +1,99 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core.cv_text import extract_job, plan_batch, remove_orphaned_documents, save_documents, stale_interns
+from core.models import CVDocument
+
+
+class Command(BaseCommand):
+    help = 'Extract searchable text from new or changed CVs using a process pool (supports --loop)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of extraction processes (1 runs in this process).'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of CVs planned and saved per round trip.'
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Also retry CVs whose previous extraction failed.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and poll for new CVs instead of exiting when everything is extracted.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=30.0,
+            help='Seconds to wait between polls when --loop is set.'
+        )
+
+    def handle(self, *args, **options):
+        executor = ProcessPoolExecutor(options['workers']) if options['workers'] > 1 else None
+        try:
+            while True:
+                started = time.perf_counter()
+                processed = self.run_once(executor, options)
+                if processed:
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(self.style.SUCCESS(f'Indexed {processed} CV(s) in {elapsed:.1f}s.'))
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def run_once(self, executor, options):
+        removed = remove_orphaned_documents()
+        if removed:
+            self.stdout.write(f'Removed {removed} document(s) for deleted CVs.')
+
+        processed = 0
+        last_id = 0
+        while True:
+            # Keyset over the stale set so failures that stay stale can't loop forever.
+            interns = list(
+                stale_interns(options['retry_failed'])
+                .filter(id__gt=last_id)
+                .only('id', 'cv')[:options['batch_size']]
+            )
+            if not interns:
+                return processed
+            last_id = interns[-1].id
+
+            documents, jobs, followers = plan_batch(interns)
+            mapper = executor.map if executor is not None else map
+            extracted = {}
+            for intern_id, cv_name, sha256, status, text, error in mapper(extract_job, jobs):
+                document = CVDocument(
+                    intern_id=intern_id, cv_name=cv_name, sha256=sha256,
+                    text=text, status=status, error=error,
+                )
+                documents.append(document)
+                extracted[sha256] = document
+            for intern_id, cv_name, sha256 in followers:
+                source = extracted[sha256]
+                documents.append(CVDocument(
+                    intern_id=intern_id, cv_name=cv_name, sha256=sha256,
+                    text=source.text, status=source.status, error=source.error,
+                ))
+
+            save_documents(documents)
+            processed += len(documents)
+            failed = sum(1 for document in documents if document.status == 'failed')
+            if failed:
+                self.stderr.write(f'{failed} CV(s) could not be read in this batch.')
@@ -0,0 +1,70 @@
+import posixpath
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import Intern
+from core.storage import get_cv_storage
+
+
+def walk(storage, path):
+    directories, files = storage.listdir(path)
+    for name in files:
+        yield posixpath.join(path, name)
+    for directory in directories:
+        yield from walk(storage, posixpath.join(path, directory))
+
+
+class Command(BaseCommand):
+    help = 'Delete stored CV files that no intern references any more (supports --dry-run)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the files that would be deleted without deleting them.'
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=60,
+            help='Only delete files older than this many minutes, so uploads still being saved are kept.'
+        )
+
+    def handle(self, *args, **options):
+        storage = get_cv_storage()
+        upload_to = Intern._meta.get_field('cv').upload_to.rstrip('/')
+        if not storage.exists(upload_to):
+            self.stdout.write('No CV files stored.')
+            return
+
+        # Read the referenced names before listing, so a CV saved while the
+        # command runs is protected by --min-age rather than by this set.
+        referenced = set(Intern.objects.exclude(cv='').values_list('cv', flat=True).iterator())
+        cutoff = timezone.now() - timedelta(minutes=options['min_age'])
+
+        deleted = kept = freed = 0
+        for name in walk(storage, upload_to):
+            if name in referenced:
+                kept += 1
+                continue
+            if storage.get_modified_time(name) > cutoff:
+                kept += 1
+                continue
+            size = storage.size(name)
+            if options['dry_run']:
+                self.stdout.write(f'Would delete {name}')
+            elif Intern.objects.filter(cv=name).exists():
+                # Referenced since the set was read: an upload deduplicated onto it.
+                kept += 1
+                continue
+            else:
+                storage.delete(name)
+            deleted += 1
+            freed += size
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {deleted} unreferenced file(s) ({freed} bytes); {kept} kept.'
+        ))
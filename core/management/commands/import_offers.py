@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.offer_import import BATCH_SIZE, FORMATS, detect_format, import_offers
+
+
+class Command(BaseCommand):
+    help = 'Bulk import internship offers from a CSV, JSON or JSON Lines file (supports --dry-run)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import.')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='File format (guessed from the extension by default).'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Number of offers inserted per query.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate every row and report errors without inserting anything.'
+        )
+
+    def handle(self, *args, **options):
+        import_format = options['format'] or detect_format(options['path'])
+        started = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as stream:
+                result = import_offers(stream, import_format, options['batch_size'], options['dry_run'])
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Could not read {options["path"]}: {exc}')
+        elapsed = time.perf_counter() - started
+
+        for error in result.errors:
+            self.stderr.write(str(error))
+
+        if result.dry_run:
+            self.stdout.write(f'Dry run: {result.valid} of {result.rows} row(s) are valid.')
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Imported {result.created} of {result.rows} offer(s) in {elapsed:.1f}s.'
+            ))
+        if result.errors:
+            self.stdout.write(self.style.WARNING(f'{len(result.errors)} row(s) rejected.'))
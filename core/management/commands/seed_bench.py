@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+
+from core.seeding import BATCH_SIZE, BENCH_PASSWORD, seed
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic data set (users, interns, offers, applications, interviews) for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interns',
+            type=int,
+            default=10000,
+            help='Number of intern accounts to create.'
+        )
+        parser.add_argument(
+            '--offers',
+            type=int,
+            help='Number of offers to create (default: one per 20 interns, at least 50).'
+        )
+        parser.add_argument(
+            '--applications-per-intern',
+            type=int,
+            default=3,
+            help='Average number of applications per intern.'
+        )
+        parser.add_argument(
+            '--interview-ratio',
+            type=float,
+            default=0.5,
+            help='Share of approved applications that get an interview.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Interns inserted per transaction.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed; the same seed gives the same data shape.'
+        )
+        parser.add_argument(
+            '--prefix',
+            default='bench',
+            help='Username prefix of the generated accounts.'
+        )
+
+    def handle(self, *args, **options):
+        def progress(result):
+            self.stdout.write(f'  {result.users} interns, {result.applications} applications, {result.interviews} interviews')
+
+        result = seed(
+            options['interns'],
+            offers=options['offers'],
+            applications_per_intern=options['applications_per_intern'],
+            interview_ratio=options['interview_ratio'],
+            batch_size=options['batch_size'],
+            random_seed=options['seed'],
+            prefix=options['prefix'],
+            progress=progress if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {result.users} interns, {result.offers} offers, {result.applications} applications and '
+            f'{result.interviews} interviews ({result.rows} rows) in {result.seconds:.1f}s '
+            f'({result.rows / max(result.seconds, 1e-9):.0f} rows/s).'
+        ))
+        self.stdout.write(f"Accounts are named {options['prefix']}-<n> with the password '{BENCH_PASSWORD}'.")
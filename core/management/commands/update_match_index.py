@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.matching import cache_dir, get_match_index
+
+
+class Command(BaseCommand):
+    help = 'Re-vectorise offers and CVs that changed since the last run and save the match index to disk'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and refresh periodically instead of exiting.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=300.0,
+            help='Seconds to wait between refreshes when --loop is set.'
+        )
+
+    def handle(self, *args, **options):
+        index = get_match_index()
+        if index is None:
+            raise CommandError('Matching requires numpy and scipy.')
+
+        while True:
+            started = time.perf_counter()
+            changes = {name: index.refresh(name) for name in index.sources}
+            if any(updated or removed for updated, removed in changes.values()):
+                index.save()
+            elapsed = time.perf_counter() - started
+            summary = ', '.join(
+                f'{name}: {updated} updated, {removed} removed, {len(index.stores[name])} total'
+                for name, (updated, removed) in changes.items()
+            )
+            self.stdout.write(self.style.SUCCESS(f'{summary} ({elapsed:.1f}s, {cache_dir()})'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,341 @@
+import os
+import re
+import tempfile
+import threading
+import zlib
+from collections import Counter
+from functools import lru_cache
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # Matching is optional; scores are simply not shown.
+    np = sparse = None
+
+from django.conf import settings
+
+from .models import CVDocument, InternshipApplication, InternshipOffer
+
+# Hashed feature space: no vocabulary to keep in sync, so a changed row can
+# be re-vectorised on its own.
+N_FEATURES = 2 ** 18
+TOKEN_RE = re.compile(r'[^\W\d_][\w+#.-]*[\w+#]|[^\W\d_]', re.UNICODE)
+STOP_WORDS = frozenset("""
+a an and are as at be been but by can for from has have in into is it its of on or our over that the their
+them they this to under was we were will with within you your who which what when where how all any able
+""".split())
+
+# Source texts are loaded this many rows at a time when refreshing.
+REFRESH_CHUNK_SIZE = 2000
+
+_lock = threading.Lock()
+_index = None
+
+
+def is_available():
+    return np is not None
+
+
+def cache_dir():
+    return getattr(settings, 'MATCHING_CACHE_DIR', None) or os.path.join(tempfile.gettempdir(), 'interntracker-matching')
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall(text.lower()) if len(token) > 1 and token not in STOP_WORDS]
+
+
+@lru_cache(maxsize=2 ** 17)
+def feature_index(token):
+    return zlib.crc32(token.encode()) % N_FEATURES
+
+
+def term_counts(text):
+    """Term counts of ``text`` in the hashed feature space."""
+    return Counter(map(feature_index, tokenize(text)))
+
+
+def _rows_matrix(texts):
+    indptr, indices, data = [0], [], []
+    for text in texts:
+        counts = term_counts(text)
+        indices.extend(counts.keys())
+        data.extend(counts.values())
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(texts), N_FEATURES),
+    )
+    # Sublinear term frequency, applied to all rows at once.
+    matrix.data = 1.0 + np.log(matrix.data)
+    matrix.sort_indices()
+    return matrix
+
+
+def _document_frequencies(matrix):
+    return np.bincount(matrix.indices, minlength=N_FEATURES).astype(np.int64)
+
+
+class VectorStore:
+    """Term-frequency rows for one side of the match, keyed by object id.
+
+    ``versions`` records what each row was computed from (offer timestamp,
+    CV hash), so refreshes only re-vectorise rows whose source changed.
+    """
+
+    def __init__(self, ids=(), versions=(), matrix=None):
+        self.ids = list(ids)
+        self.versions = list(versions)
+        self.matrix = matrix if matrix is not None else sparse.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self.df = _document_frequencies(self.matrix)
+        self.positions = {pk: position for position, pk in enumerate(self.ids)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def stale(self, current):
+        """Ids in ``current`` (id -> version) whose cached row is missing or outdated."""
+        return [
+            pk for pk, version in current.items()
+            if pk not in self.positions or self.versions[self.positions[pk]] != version
+        ]
+
+    def update(self, new_ids, new_versions, new_matrix, removed=()):
+        """Replace or add the rows for ``new_ids`` and drop ``removed`` ids."""
+        dropped = [self.positions[pk] for pk in set(removed) | set(new_ids) if pk in self.positions]
+        # Document frequencies are adjusted by the changed rows only.
+        self.df -= _document_frequencies(self.matrix[dropped])
+        self.df += _document_frequencies(new_matrix)
+
+        dropped = set(dropped)
+        keep = [position for position in range(len(self.ids)) if position not in dropped]
+        self.matrix = sparse.vstack([self.matrix[keep], new_matrix], format='csr')
+        self.ids = [self.ids[position] for position in keep] + new_ids
+        self.versions = [self.versions[position] for position in keep] + list(new_versions)
+        self.positions = {pk: position for position, pk in enumerate(self.ids)}
+
+    def save(self, path):
+        # Write next to the target and rename, so readers never see half a file.
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as handle:
+            np.savez(
+                handle,
+                ids=np.asarray(self.ids, dtype=np.int64),
+                versions=np.asarray(self.versions, dtype=str),
+                data=self.matrix.data,
+                indices=self.matrix.indices,
+                indptr=self.matrix.indptr,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            matrix = sparse.csr_matrix(
+                (arrays['data'], arrays['indices'], arrays['indptr']),
+                shape=(len(arrays['ids']), N_FEATURES),
+            )
+            return cls(arrays['ids'].tolist(), arrays['versions'].tolist(), matrix)
+
+
+def _offer_versions(ids=None):
+    queryset = InternshipOffer.objects.all()
+    if ids is not None:
+        queryset = queryset.filter(id__in=ids)
+    return {pk: str(updated_at.timestamp()) for pk, updated_at in queryset.values_list('id', 'updated_at').iterator()}
+
+
+def _offer_texts(ids):
+    rows = InternshipOffer.objects.filter(id__in=ids).values_list('id', 'title', 'requirements', 'description')
+    # Title and requirements count double: they describe the skills sought.
+    return {pk: f'{title} {title} {requirements} {requirements} {description}' for pk, title, requirements, description in rows}
+
+
+def _cv_versions(ids=None):
+    queryset = CVDocument.objects.filter(status='ok')
+    if ids is not None:
+        queryset = queryset.filter(intern_id__in=ids)
+    return dict(queryset.values_list('intern_id', 'sha256').iterator())
+
+
+def _cv_texts(ids):
+    return dict(CVDocument.objects.filter(intern_id__in=ids).values_list('intern_id', 'text'))
+
+
+class MatchIndex:
+    """TF-IDF similarity between offers and intern CVs.
+
+    IDF is taken over both corpora and rows are L2-normalised at query
+    time, so a score is the cosine similarity of the two documents. The
+    stores on disk are updated by ``manage.py update_match_index``; rows
+    edited since then are vectorised on the fly for the query only.
+    """
+
+    sources = {
+        'offers': (_offer_versions, _offer_texts),
+        'cvs': (_cv_versions, _cv_texts),
+    }
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.stores = {}
+        self.mtimes = {}
+        for name in self.sources:
+            self.stores[name] = self._load(name)
+
+    def path(self, name):
+        return os.path.join(self.directory, f'{name}.npz')
+
+    def _mtime(self, name):
+        try:
+            return os.path.getmtime(self.path(name))
+        except OSError:
+            return None
+
+    def _load(self, name):
+        self.mtimes[name] = self._mtime(name)
+        try:
+            return VectorStore.load(self.path(name))
+        except (OSError, ValueError, KeyError):
+            return VectorStore()
+
+    def reload_if_changed(self):
+        for name in self.sources:
+            if self._mtime(name) != self.mtimes[name]:
+                self.stores[name] = self._load(name)
+
+    def refresh(self, name):
+        """Re-vectorise rows whose source changed; returns ``(updated, removed)``."""
+        versions, texts = self.sources[name]
+        store = self.stores[name]
+        current = versions()
+        removed = [pk for pk in store.ids if pk not in current]
+        stale = store.stale(current)
+        if stale or removed:
+            matrices = []
+            for start in range(0, len(stale), REFRESH_CHUNK_SIZE):
+                chunk = stale[start:start + REFRESH_CHUNK_SIZE]
+                loaded = texts(chunk)
+                matrices.append(_rows_matrix([loaded.get(pk, '') for pk in chunk]))
+            new_matrix = sparse.vstack(matrices, format='csr') if matrices else _rows_matrix([])
+            store.update(stale, [current[pk] for pk in stale], new_matrix, removed)
+        return len(stale), len(removed)
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        for name, store in self.stores.items():
+            store.save(self.path(name))
+            self.mtimes[name] = self._mtime(name)
+
+    def idf(self):
+        offers, cvs = self.stores['offers'], self.stores['cvs']
+        documents = len(offers) + len(cvs)
+        return (np.log((1 + documents) / (1 + offers.df + cvs.df)) + 1).astype(np.float32)
+
+    def vectors(self, name, ids, idf):
+        """L2-normalised TF-IDF rows for ``ids`` and a mask of ids that have a document."""
+        versions, texts = self.sources[name]
+        store = self.stores[name]
+        current = versions(set(ids))
+        fresh_ids = set(store.stale(current))
+        fresh = texts(fresh_ids) if fresh_ids else {}
+
+        cached_positions, fresh_texts, order = [], [], []
+        for pk in ids:
+            if pk not in current:
+                order.append(None)
+            elif pk in fresh_ids:
+                order.append(('fresh', len(fresh_texts)))
+                fresh_texts.append(fresh.get(pk, ''))
+            else:
+                order.append(('cached', len(cached_positions)))
+                cached_positions.append(store.positions[pk])
+
+        # One empty row at the end stands in for ids without a document.
+        combined = sparse.vstack([
+            store.matrix[cached_positions],
+            _rows_matrix(fresh_texts),
+            sparse.csr_matrix((1, N_FEATURES), dtype=np.float32),
+        ], format='csr')
+        offsets = {'cached': 0, 'fresh': len(cached_positions)}
+        empty = combined.shape[0] - 1
+        rows = combined[[empty if item is None else offsets[item[0]] + item[1] for item in order]]
+
+        rows = rows @ sparse.diags(idf)
+        norms = np.sqrt(np.asarray(rows.multiply(rows).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        present = np.asarray([item is not None for item in order])
+        return sparse.diags(1.0 / norms) @ rows, present
+
+    def score_pairs(self, pairs):
+        """Cosine similarity for each ``(offer_id, intern_id)``; None without CV text."""
+        if not pairs:
+            return []
+        idf = self.idf()
+        offers, _ = self.vectors('offers', [offer_id for offer_id, _ in pairs], idf)
+        cvs, has_cv = self.vectors('cvs', [intern_id for _, intern_id in pairs], idf)
+        # Row-wise dot products of the two aligned matrices in one pass.
+        scores = np.asarray(offers.multiply(cvs).sum(axis=1)).ravel()
+        return [float(score) if present else None for score, present in zip(scores, has_cv)]
+
+    def rank(self, offer_id, intern_ids):
+        """``[(intern_id, score)]`` for one offer, best first; interns without CV text last."""
+        if not intern_ids:
+            return []
+        idf = self.idf()
+        offer, _ = self.vectors('offers', [offer_id], idf)
+        cvs, has_cv = self.vectors('cvs', intern_ids, idf)
+        scores = (cvs @ offer.T).toarray().ravel()
+        ranked = [
+            (intern_id, float(score) if present else None)
+            for intern_id, score, present in zip(intern_ids, scores, has_cv)
+        ]
+        return sorted(ranked, key=lambda item: (item[1] is None, -(item[1] or 0)))
+
+
+def get_match_index():
+    """The process-wide index, reloaded when the on-disk cache changes."""
+    global _index
+    if not is_available():
+        return None
+    with _lock:
+        if _index is None:
+            _index = MatchIndex(cache_dir())
+        else:
+            _index.reload_if_changed()
+        return _index
+
+
+def as_percent(score):
+    return None if score is None else round(score * 100)
+
+
+def application_scores(pairs):
+    """Match percentages for ``(offer_id, intern_id)`` pairs, in order."""
+    index = get_match_index()
+    if index is None:
+        return [None] * len(pairs)
+    return [as_percent(score) for score in index.score_pairs(pairs)]
+
+
+def ranked_applications(offer_id):
+    """``[(application_id, percent)]`` for every application to the offer, best first."""
+    index = get_match_index()
+    if index is None:
+        return []
+    applications = dict(
+        InternshipApplication.objects.filter(internship_offer_id=offer_id).values_list('intern_id', 'id')
+    )
+    return [(applications[intern_id], as_percent(score)) for intern_id, score in index.rank(offer_id, list(applications))]
+
+
+def top_match_scores(offer_ids):
+    """Best applicant match percentage per offer, for a page of offers."""
+    pairs = list(
+        InternshipApplication.objects.filter(internship_offer_id__in=offer_ids)
+        .values_list('internship_offer_id', 'intern_id')
+    )
+    best = {}
+    for (offer_id, _), score in zip(pairs, application_scores(pairs)):
+        if score is not None and score > best.get(offer_id, -1):
+            best[offer_id] = score
+    return best
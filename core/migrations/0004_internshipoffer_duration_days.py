@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+def populate_duration_days(apps, schema_editor):
+    InternshipOffer = apps.get_model('core', 'InternshipOffer')
+    unit_days = {'month': 30, 'year': 365}
+    batch = []
+    for offer in InternshipOffer.objects.only('id', 'duration').iterator(chunk_size=2000):
+        parts = (offer.duration or '').lower().split()
+        if len(parts) < 2 or not parts[0].isdigit():
+            continue
+        for unit, days in unit_days.items():
+            if unit in parts[1]:
+                offer.duration_days = int(parts[0]) * days
+                batch.append(offer)
+                break
+        if len(batch) >= 2000:
+            InternshipOffer.objects.bulk_update(batch, ['duration_days'])
+            batch = []
+    if batch:
+        InternshipOffer.objects.bulk_update(batch, ['duration_days'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_alter_interview_application'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internshipoffer',
+            name='duration_days',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='internshipoffer',
+            name='duration',
+            field=models.CharField(help_text="e.g., '3 months', '6 months', '1 year'", max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='internshipoffer',
+            name='end_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_duration_days, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='internshipoffer',
+            index=models.Index(fields=['department'], name='offer_department_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internshipoffer',
+            index=models.Index(fields=['duration_days', 'duration'], name='offer_duration_idx'),
+        ),
+    ]
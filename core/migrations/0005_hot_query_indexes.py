@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_internshipoffer_duration_days'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='internshipapplication',
+            index=models.Index(fields=['-applied_at', '-id'], name='application_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internshipapplication',
+            index=models.Index(fields=['status', '-applied_at', '-id'], name='application_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internshipapplication',
+            index=models.Index(fields=['internship_offer', 'status'], name='application_offer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internshipoffer',
+            index=models.Index(fields=['-start_date', '-id'], name='offer_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internshipoffer',
+            index=models.Index(fields=['is_archived', '-start_date', '-id'], name='offer_archived_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['date_time', 'id'], name='interview_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['status', 'date_time'], name='interview_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:19
+
+import core.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_internshipoffer_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='intern',
+            name='cv',
+            field=models.FileField(storage=core.storage.get_cv_storage, upload_to='cvs/', validators=[django.core.validators.FileExtensionValidator(['pdf', 'doc', 'docx', 'odt', 'rtf', 'txt']), core.storage.validate_cv_size]),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_intern_cv_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVDocument',
+            fields=[
+                ('intern', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='cv_document', serialize=False, to='core.intern')),
+                ('cv_name', models.CharField(max_length=255)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('text', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('ok', 'Extracted'), ('empty', 'No text'), ('unsupported', 'Unsupported format'), ('failed', 'Failed')], default='ok', max_length=20)),
+                ('error', models.TextField(blank=True)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_interview_duration_minutes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedInterview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('interview_id', models.PositiveBigIntegerField(unique=True)),
+                ('date_time', models.DateTimeField()),
+                ('duration_minutes', models.PositiveSmallIntegerField(default=60)),
+                ('interview_type', models.CharField(choices=[('zoom', 'Zoom'), ('in_person', 'In Person')], max_length=20)),
+                ('status', models.CharField(choices=[('scheduled', 'Scheduled'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled'), ('no_show', 'No Show')], max_length=20)),
+                ('zoom_link', models.URLField(blank=True)),
+                ('location', models.TextField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('feedback', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_interviews', to='core.internshipapplication')),
+            ],
+        ),
+    ]
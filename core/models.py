@@ -2,63 +2,96 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from django.core.validators import FileExtensionValidator, MaxValueValidator, MinValueValidator
 from datetime import date, timedelta
 
+from .storage import CV_EXTENSIONS, get_cv_storage, validate_cv_size
+
+
+DURATION_UNIT_DAYS = {
+    'month': 30,
+    'year': 365,
+}
+
+
+def parse_duration_days(duration):
+    """Convert a duration such as '3 months' or '1 year' to a number of days.
+
+    Returns None when there is no unit, raises ValueError when the amount is
+    not a number and ValidationError when the unit is not supported.
+    """
+    parts = duration.lower().split()
+    if len(parts) < 2:
+        return None
+    amount = int(parts[0])
+    unit = parts[1]
+    for name, days in DURATION_UNIT_DAYS.items():
+        if name in unit:
+            return amount * days
+    raise ValidationError("Duration must be in months or years")
+
 
 class InternshipOffer(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     department = models.CharField(max_length=200)
     duration = models.CharField(max_length=100, help_text="e.g., '3 months', '6 months', '1 year'")
+    duration_days = models.PositiveIntegerField(null=True, blank=True, editable=False)
     requirements = models.TextField()
     start_date = models.DateField()
     end_date = models.DateField(blank=True, null=True)
     is_archived = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['department'], name='offer_department_idx'),
+            models.Index(fields=['duration_days', 'duration'], name='offer_duration_idx'),
+            models.Index(fields=['-start_date', '-id'], name='offer_start_idx'),
+            models.Index(fields=['is_archived', '-start_date', '-id'], name='offer_archived_start_idx'),
+        ]
+
+    def get_duration_days(self):
+        # clean() and save() both need the parsed duration; parse it once
+        # per distinct value instead of on every call.
+        cached = getattr(self, '_duration_days_cache', None)
+        if cached is None or cached[0] != self.duration:
+            cached = (self.duration, parse_duration_days(self.duration))
+            self._duration_days_cache = cached
+        return cached[1]
 
     def clean(self):
         super().clean()
         if self.start_date and self.duration:
             try:
-                duration_parts = self.duration.lower().split()
-                if len(duration_parts) >= 2:
-                    amount = int(duration_parts[0])
-                    unit = duration_parts[1]
-                    
-                    if 'month' in unit:
-                        calculated_end_date = self.start_date + timedelta(days=amount*30)
-                    elif 'year' in unit:
-                        calculated_end_date = self.start_date + timedelta(days=amount*365)
-                    else:
-                        raise ValidationError("Duration must be in months or years")
-                    
-                    if self.end_date and self.end_date != calculated_end_date:
-                        raise ValidationError(
-                            f"End date must be {calculated_end_date} based on duration of {self.duration}"
-                        )
-                    
-                    if not self.end_date:
-                        self.end_date = calculated_end_date
-                        
+                days = self.get_duration_days()
             except (ValueError, IndexError):
                 raise ValidationError("Invalid duration format. Use format like '3 months' or '1 year'")
+
+            if days is not None:
+                calculated_end_date = self.start_date + timedelta(days=days)
+
+                if self.end_date and self.end_date != calculated_end_date:
+                    raise ValidationError(
+                        f"End date must be {calculated_end_date} based on duration of {self.duration}"
+                    )
+
+                if not self.end_date:
+                    self.end_date = calculated_end_date
         
         if self.start_date and self.start_date < date.today():
             raise ValidationError("start date cannot be in the past")
 
     def save(self, *args, **kwargs):
-        if self.start_date and self.duration and not self.end_date:
+        self.duration_days = None
+        if self.duration:
             try:
-                duration_parts = self.duration.lower().split()
-                if len(duration_parts) >= 2:
-                    amount = int(duration_parts[0])
-                    unit = duration_parts[1]
-                    
-                    if 'month' in unit:
-                        self.end_date = self.start_date + timedelta(days=amount*30)
-                    elif 'year' in unit:
-                        self.end_date = self.start_date + timedelta(days=amount*365)
-            except (ValueError, IndexError):
+                self.duration_days = self.get_duration_days()
+            except (ValueError, IndexError, ValidationError):
                 pass
+
+        if self.start_date and self.duration_days is not None and not self.end_date:
+            self.end_date = self.start_date + timedelta(days=self.duration_days)
         
         super().save(*args, **kwargs)
 
@@ -68,11 +101,35 @@ class InternshipOffer(models.Model):
 
 class Intern(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
-    cv = models.FileField(upload_to='cvs/')
+    cv = models.FileField(
+        upload_to='cvs/',
+        storage=get_cv_storage,
+        validators=[FileExtensionValidator(CV_EXTENSIONS), validate_cv_size],
+    )
    
     def __str__(self):
         return self.user.get_full_name() or self.user.username
 
+class CVDocument(models.Model):
+    STATUS_CHOICES = [
+        ('ok', 'Extracted'),
+        ('empty', 'No text'),
+        ('unsupported', 'Unsupported format'),
+        ('failed', 'Failed'),
+    ]
+
+    # Shares the intern's primary key so the search index rowid is the intern id.
+    intern = models.OneToOneField(Intern, on_delete=models.CASCADE, primary_key=True, related_name='cv_document')
+    cv_name = models.CharField(max_length=255)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    text = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ok')
+    error = models.TextField(blank=True)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"CV text for {self.intern} ({self.status})"
+
 class InternshipApplication(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -87,11 +144,20 @@ class InternshipApplication(models.Model):
     
     class Meta:
         unique_together = ('intern', 'internship_offer')
+        indexes = [
+            models.Index(fields=['-applied_at', '-id'], name='application_applied_idx'),
+            models.Index(fields=['status', '-applied_at', '-id'], name='application_status_idx'),
+            models.Index(fields=['internship_offer', 'status'], name='application_offer_status_idx'),
+        ]
  
     def __str__(self):
         return f"{self.intern} - {self.internship_offer.title} ({self.status})"
 
     
+DEFAULT_INTERVIEW_MINUTES = 60
+MAX_INTERVIEW_MINUTES = 8 * 60
+
+
 class Interview(models.Model):
     STATUS_CHOICES = [
         ('scheduled', 'Scheduled'),
@@ -108,6 +174,10 @@ class Interview(models.Model):
     
     application = models.OneToOneField(InternshipApplication, on_delete=models.CASCADE, related_name='interview', null=True, blank=True)
     date_time = models.DateTimeField()
+    duration_minutes = models.PositiveSmallIntegerField(
+        default=DEFAULT_INTERVIEW_MINUTES,
+        validators=[MinValueValidator(5), MaxValueValidator(MAX_INTERVIEW_MINUTES)],
+    )
     interview_type = models.CharField(max_length=20, choices=INTERVIEW_TYPES)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='scheduled')
     zoom_link = models.URLField(blank=True, help_text="Required for Zoom interviews")
@@ -117,6 +187,12 @@ class Interview(models.Model):
     archived = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date_time', 'id'], name='interview_date_idx'),
+            models.Index(fields=['status', 'date_time'], name='interview_status_date_idx'),
+        ]
     
     def __str__(self):
         if self.application:
@@ -141,3 +217,56 @@ class Interview(models.Model):
                 
         if self.status == 'completed' and not self.feedback:
             self.feedback = 'Completed as scheduled.'
+
+
+class ArchivedInterview(models.Model):
+    """Cold copy of an interview moved out of the live table by ``archive_stale --move``."""
+
+    interview_id = models.PositiveBigIntegerField(unique=True)
+    application = models.ForeignKey(InternshipApplication, on_delete=models.SET_NULL, related_name='archived_interviews', null=True, blank=True)
+    date_time = models.DateTimeField()
+    duration_minutes = models.PositiveSmallIntegerField(default=DEFAULT_INTERVIEW_MINUTES)
+    interview_type = models.CharField(max_length=20, choices=Interview.INTERVIEW_TYPES)
+    status = models.CharField(max_length=20, choices=Interview.STATUS_CHOICES)
+    zoom_link = models.URLField(blank=True)
+    location = models.TextField(blank=True, null=True)
+    notes = models.TextField(blank=True, null=True)
+    feedback = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archived interview #{self.interview_id} - {self.date_time}"
+
+
+class OutgoingEmail(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    content_subtype = models.CharField(max_length=20, default='html')
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at', 'id'],
+                condition=models.Q(status='pending'),
+                name='outgoing_email_due_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,152 @@
+import csv
+import io
+import json
+import os
+from dataclasses import dataclass, field
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import transaction
+
+from .counters import invalidate_dashboard_metrics
+from .models import InternshipOffer
+
+IMPORT_FIELDS = ('title', 'description', 'department', 'duration', 'requirements', 'start_date', 'end_date')
+BATCH_SIZE = 1000
+FORMATS = ('csv', 'json', 'jsonl')
+
+
+@dataclass
+class RowError:
+    line: int
+    messages: list
+
+    def __str__(self):
+        return f"Row {self.line}: {'; '.join(self.messages)}"
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    errors: list = field(default_factory=list)
+    dry_run: bool = False
+
+    @property
+    def valid(self):
+        return self.rows - len(self.errors)
+
+
+def detect_format(filename):
+    extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
+    return extension if extension in FORMATS else 'csv'
+
+
+def read_rows(stream, import_format='csv'):
+    """Yield ``(line, row)`` pairs from a binary file of offers.
+
+    CSV and JSON Lines are read incrementally; a plain JSON file must hold a
+    list of objects and is loaded in one go.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if import_format == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    elif import_format == 'jsonl':
+        for line, raw in enumerate(text, start=1):
+            if raw.strip():
+                yield line, json.loads(raw)
+    else:
+        data = json.load(text)
+        if not isinstance(data, list):
+            raise ValueError('A JSON import must contain a list of offers.')
+        yield from enumerate(data, start=1)
+    text.detach()
+
+
+def _error_messages(exc):
+    if not hasattr(exc, 'error_dict'):
+        return exc.messages
+    messages = []
+    for name, errors in exc.message_dict.items():
+        prefix = '' if name == NON_FIELD_ERRORS else f'{name}: '
+        messages.extend(prefix + error for error in errors)
+    return messages
+
+
+class OfferImporter:
+    """Validate offer rows with the model's own rules and insert them in batches."""
+
+    def __init__(self, batch_size=BATCH_SIZE, dry_run=False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        # Spreadsheets reuse a handful of durations; parse each one once.
+        self._durations = {}
+
+    def build(self, row):
+        if not isinstance(row, dict):
+            raise ValidationError('Each row must be an object.')
+        values = {}
+        for name in IMPORT_FIELDS:
+            value = row.get(name)
+            if isinstance(value, str):
+                value = value.strip()
+            if value in ('', None):
+                value = None if InternshipOffer._meta.get_field(name).null else ''
+            values[name] = value
+
+        offer = InternshipOffer(**values)
+
+        # Same checks as full_clean(validate_unique=False), but clean() only
+        # runs once the fields have been converted to Python values.
+        offer.clean_fields()
+        # Keyed like parse_duration_days() reads it, so '3 Months' and
+        # '3  months' share one entry.
+        key = ' '.join(offer.duration.lower().split())
+        if key in self._durations:
+            offer._duration_days_cache = (offer.duration, self._durations[key])
+        offer.clean()
+
+        offer.duration_days = offer.get_duration_days()
+        self._durations[key] = offer.duration_days
+        return offer
+
+    def run(self, rows):
+        # All or nothing: a file that turns out to be unreadable part way
+        # through (bad encoding, a malformed line) raises ValueError and must
+        # not leave its first batches behind, or uploading the fixed file
+        # again would duplicate them. Rejected rows do not roll back.
+        with transaction.atomic():
+            return self._run(rows)
+
+    def _run(self, rows):
+        result = ImportResult(dry_run=self.dry_run)
+        batch = []
+        for line, row in rows:
+            result.rows += 1
+            try:
+                batch.append(self.build(row))
+            except ValidationError as exc:
+                result.errors.append(RowError(line, _error_messages(exc)))
+                continue
+            if len(batch) >= self.batch_size:
+                result.created += self._insert(batch)
+                batch = []
+        result.created += self._insert(batch)
+
+        if result.created:
+            invalidate_dashboard_metrics()
+        return result
+
+    def _insert(self, batch):
+        if self.dry_run or not batch:
+            return 0
+        # bulk_create skips save() and signals; duration_days and end_date
+        # were already filled in by build(), and the search index is kept
+        # up to date by database triggers.
+        InternshipOffer.objects.bulk_create(batch, batch_size=self.batch_size)
+        return len(batch)
+
+
+def import_offers(stream, import_format='csv', batch_size=BATCH_SIZE, dry_run=False):
+    return OfferImporter(batch_size=batch_size, dry_run=dry_run).run(read_rows(stream, import_format))
@@ -0,0 +1,147 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 60
+# A claimed batch is hidden from other workers for this long; if the worker
+# dies mid-batch the messages become due again afterwards.
+CLAIM_SECONDS = 300
+
+_executor = None
+
+
+def build_email(subject, template_name, context, to):
+    """Render a notification into an unsaved OutgoingEmail."""
+    return OutgoingEmail(
+        subject=subject,
+        body=render_to_string(template_name, context),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+    )
+
+
+def queue_emails(emails):
+    """Insert rendered emails in the caller's transaction and schedule delivery.
+
+    Nothing is sent from the request: the rows are only inserted, and the
+    worker picks them up once the transaction has committed.
+    """
+    emails = OutgoingEmail.objects.bulk_create(emails)
+    if emails:
+        transaction.on_commit(_notify_worker)
+    return emails
+
+
+def queue_email(subject, template_name, context, to):
+    return queue_emails([build_email(subject, template_name, context, to)])[0]
+
+
+def _notify_worker():
+    # Optional in-process runner; deployments running the send_queued_emails
+    # command leave OUTBOX_SEND_ON_COMMIT off.
+    global _executor
+    if not getattr(settings, 'OUTBOX_SEND_ON_COMMIT', False):
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outbox')
+    _executor.submit(_send_in_thread)
+
+
+def _send_in_thread():
+    try:
+        while send_pending()[0]:
+            pass
+    except Exception:
+        logger.exception('Outbox delivery failed')
+    finally:
+        close_old_connections()
+
+
+def claim_batch(batch_size=BATCH_SIZE):
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutgoingEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutgoingEmail.objects.filter(id__in=ids).update(next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS))
+    return list(OutgoingEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def _as_message(email, connection):
+    message = EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        connection=connection,
+    )
+    message.content_subtype = email.content_subtype
+    return message
+
+
+def deliver(emails, connection):
+    """Send ``emails`` over one open connection; return the ones that failed with their errors.
+
+    Messages go out one at a time, so a rejected recipient or a dropped
+    connection never causes a message the server already accepted to be
+    sent again.
+    """
+    failures = []
+    for email in emails:
+        try:
+            connection.send_messages([_as_message(email, connection)])
+        except Exception as exc:
+            failures.append((email, exc))
+    return failures
+
+
+def send_pending(batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS, connection=None):
+    """Deliver one batch of due emails. Returns ``(sent, failed)`` counts."""
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0
+
+    failures = None
+    try:
+        connection = connection or get_connection()
+        with connection:
+            failures = deliver(emails, connection)
+    except Exception as exc:
+        # Only reached before anything was sent (an error closing the
+        # connection afterwards does not undo the delivery).
+        if failures is None:
+            logger.warning('Could not open the mail connection: %s', exc)
+            failures = [(email, exc) for email in emails]
+
+    now = timezone.now()
+    failed_ids = {email.id for email, _ in failures}
+    sent_ids = [email.id for email in emails if email.id not in failed_ids]
+    OutgoingEmail.objects.filter(id__in=sent_ids).update(status='sent', sent_at=now, last_error='')
+
+    retry = []
+    for email, exc in failures:
+        email.attempts += 1
+        email.last_error = str(exc)
+        if email.attempts >= max_attempts:
+            email.status = 'failed'
+        else:
+            email.next_attempt_at = now + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (email.attempts - 1))
+        retry.append(email)
+    OutgoingEmail.objects.bulk_update(retry, ['attempts', 'last_error', 'status', 'next_attempt_at'])
+    return len(sent_ids), len(failures)
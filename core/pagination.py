@@ -0,0 +1,168 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+
+# Above this many rows an exact COUNT(*) is not worth its cost; databases
+# without row estimates report "N+" instead.
+COUNT_CAP = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(data):
+    raw = json.dumps(data, separators=(',', ':'), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(str(exc)) from exc
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, total=None,
+                 total_is_estimate=False, total_is_lower_bound=False):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+        self.total_is_lower_bound = total_is_lower_bound
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def estimate_count(queryset, cap=COUNT_CAP):
+    """Return ``(count, is_estimate, is_lower_bound)`` without an unbounded COUNT(*).
+
+    PostgreSQL answers from the planner's row estimate; other databases
+    count at most ``cap`` rows.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        plan = queryset.order_by().explain(format='json')
+        return int(json.loads(plan)[0]['Plan']['Plan Rows']), True, False
+    count = queryset.order_by()[:cap + 1].count()
+    return min(count, cap), False, count > cap
+
+
+class CursorPaginator:
+    """Keyset pagination over a unique ordering such as ('-applied_at', '-id').
+
+    Every page is a single indexed range scan, so page N costs the same as
+    page 1. The last ordering field must be unique (normally the primary key).
+    """
+
+    def __init__(self, queryset, per_page, ordering, count=False):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.count = count
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip('-'))
+            for name in self.ordering
+        ]
+
+    def _key(self, obj):
+        return [field.value_to_string(obj) for field in self.fields]
+
+    def _seek(self, values, forward):
+        # (a, b) < (x, y)  ==>  a < x OR (a = x AND b < y), per direction.
+        condition = Q()
+        equal = Q()
+        for name, field, raw in zip(self.ordering, self.fields, values):
+            value = field.to_python(raw)
+            descending = name.startswith('-')
+            attname = name.lstrip('-')
+            lookup = 'lt' if descending == forward else 'gt'
+            condition |= equal & Q(**{f'{attname}__{lookup}': value})
+            equal &= Q(**{attname: value})
+        return condition
+
+    def _reversed_ordering(self):
+        return [name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering]
+
+    def first_page_queryset(self):
+        """The query get_page() runs for the first page, e.g. to EXPLAIN it."""
+        return self.queryset.order_by(*self.ordering)[:self.per_page + 1]
+
+    def get_page(self, cursor=None):
+        forward = True
+        queryset = self.queryset.order_by(*self.ordering)
+        if cursor:
+            try:
+                data = decode_cursor(cursor)
+                values, forward = data['k'], data['d'] == 'n'
+                if len(values) != len(self.ordering):
+                    raise InvalidCursor('Cursor does not match the ordering.')
+                seek = self._seek(values, forward)
+            except (InvalidCursor, KeyError, TypeError, ValueError, ValidationError):
+                cursor, forward = None, True
+            else:
+                queryset = self.queryset.filter(seek)
+                queryset = queryset.order_by(*(self.ordering if forward else self._reversed_ordering()))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or not forward:
+                next_cursor = encode_cursor({'k': self._key(rows[-1]), 'd': 'n'})
+            if cursor and (forward or has_more):
+                previous_cursor = encode_cursor({'k': self._key(rows[0]), 'd': 'p'})
+
+        page = CursorPage(rows, next_cursor, previous_cursor)
+        if self.count:
+            page.total, page.total_is_estimate, page.total_is_lower_bound = estimate_count(self.queryset)
+        return page
+
+
+class SequenceCursorPaginator:
+    """Cursor pagination over an already ordered sequence, e.g. ranked search ids.
+
+    The sequence is sliced before len() is asked for, so lazy sequences
+    such as ``search.SearchResults`` can count while fetching the page.
+    """
+
+    def __init__(self, sequence, per_page):
+        self.sequence = sequence
+        self.per_page = per_page
+
+    def get_page(self, cursor=None):
+        start = 0
+        if cursor:
+            try:
+                start = max(int(decode_cursor(cursor)['o']), 0)
+            except (InvalidCursor, KeyError, TypeError, ValueError):
+                start = 0
+        end = start + self.per_page
+        object_list = list(self.sequence[start:end])
+        total = len(self.sequence)
+        next_cursor = encode_cursor({'o': end}) if end < total else None
+        previous_cursor = encode_cursor({'o': max(start - self.per_page, 0)}) if start > 0 else None
+        return CursorPage(object_list, next_cursor, previous_cursor, total)
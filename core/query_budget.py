@@ -0,0 +1,119 @@
+import logging
+import traceback
+from collections import Counter
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from .instrumentation import awrap_queries
+
+logger = logging.getLogger(__name__)
+
+# View (module.qualname) -> maximum number of queries per request.
+BUDGETS = {}
+
+# Transaction control repeats by design and is not reported as a duplicate.
+TRANSACTION_STATEMENTS = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def get_mode():
+    """'raise', 'log' or None; QUERY_BUDGET_MODE overrides the DEBUG default of 'log'."""
+    mode = getattr(settings, 'QUERY_BUDGET_MODE', None)
+    if mode is None and settings.DEBUG:
+        return 'log'
+    return mode or None
+
+
+def _caller_stack():
+    # Frames from our own code only; Django's ORM frames hide the culprit.
+    frames = [
+        frame for frame in traceback.extract_stack()[:-3]
+        if 'site-packages' not in frame.filename and '/django/' not in frame.filename
+    ]
+    return ''.join(traceback.format_list(frames[-8:]))
+
+
+class QueryRecorder:
+    """execute_wrapper that counts statements and remembers where the problems started."""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.count = 0
+        self.seen = Counter()
+        self.over_budget_stack = None
+        self.duplicate_stacks = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        if self.count == self.budget + 1:
+            self.over_budget_stack = _caller_stack()
+        if not sql.lstrip().upper().startswith(TRANSACTION_STATEMENTS):
+            key = (sql, repr(params))
+            self.seen[key] += 1
+            if self.seen[key] == 2:
+                self.duplicate_stacks[key] = _caller_stack()
+        return execute(sql, params, many, context)
+
+    def report(self, view_name):
+        """A description of every violation, or '' when the request stayed within budget."""
+        lines = []
+        if self.count > self.budget:
+            lines.append(f'{view_name} ran {self.count} queries; its budget is {self.budget}.')
+            lines.append(f'Query {self.budget + 1} was issued from:\n{self.over_budget_stack}')
+        for (sql, params), stack in self.duplicate_stacks.items():
+            lines.append(f'Repeated {self.seen[(sql, params)]} times with identical parameters: {sql}')
+            lines.append(f'Second run from:\n{stack}')
+        return '\n'.join(lines)
+
+
+def query_budget(max_queries):
+    """Declare how many queries a view may run per request.
+
+    Budgets are checked when QUERY_BUDGET_MODE is 'raise' (tests) or 'log'
+    (the default with DEBUG on). Identical statements run twice in one
+    request are reported as well. In production the view runs unwrapped.
+    """
+    def decorator(view_func):
+        view_name = f'{view_func.__module__}.{view_func.__qualname__}'
+        BUDGETS[view_name] = max_queries
+
+        def check(recorder, mode):
+            problems = recorder.report(view_name)
+            if problems:
+                if mode == 'raise':
+                    raise QueryBudgetExceeded(problems)
+                logger.warning(problems)
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_async_view(request, *args, **kwargs):
+                mode = get_mode()
+                if mode is None:
+                    return await view_func(request, *args, **kwargs)
+                recorder = QueryRecorder(max_queries)
+                async with awrap_queries(recorder, ['default']):
+                    response = await view_func(request, *args, **kwargs)
+                check(recorder, mode)
+                return response
+            _wrapped_async_view.query_budget = max_queries
+            return _wrapped_async_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            mode = get_mode()
+            if mode is None:
+                return view_func(request, *args, **kwargs)
+            recorder = QueryRecorder(max_queries)
+            with connections['default'].execute_wrapper(recorder):
+                response = view_func(request, *args, **kwargs)
+            check(recorder, mode)
+            return response
+        _wrapped_view.query_budget = max_queries
+        return _wrapped_view
+    return decorator
@@ -0,0 +1,317 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import invalidate_dashboard_metrics, invalidate_intern_summaries
+from .models import MAX_INTERVIEW_MINUTES, InternshipApplication, Interview
+from .outbox import build_email, queue_emails
+
+# Only these interviews occupy a room and a candidate.
+BLOCKING_STATUSES = ('scheduled', 'in_progress')
+SLOT_STEP_MINUTES = 15
+
+
+@dataclass(frozen=True, order=True)
+class Slot:
+    start: datetime
+    end: datetime
+
+
+def location_key(interview_type, location=None, zoom_link=None):
+    """The room an interview occupies: a physical location or a Zoom meeting."""
+    if interview_type == 'in_person' and location:
+        return ('location', ' '.join(location.lower().split()))
+    if interview_type == 'zoom' and zoom_link:
+        return ('zoom', zoom_link.strip().rstrip('/').lower())
+    return None
+
+
+def candidate_key(intern_id):
+    return ('candidate', intern_id) if intern_id else None
+
+
+def interview_keys(interview_type, location, zoom_link, intern_id):
+    return [key for key in (location_key(interview_type, location, zoom_link), candidate_key(intern_id)) if key]
+
+
+class IntervalIndex:
+    """Sorted intervals per key (a room or a candidate).
+
+    Overlap queries bisect to the last interval starting before the query
+    ends and walk back only as far as the longest interval for that key
+    could reach, so they cost O(log n + k) for k conflicts.
+
+    Entries live in plain sorted lists: ``add`` is an O(n) ``insort``, but
+    that is a memmove over at most one window of interviews per key, cheaper
+    in CPython than any pure-Python balanced tree at these sizes. Bulk loads
+    go through ``extend``, which sorts once.
+    """
+
+    def __init__(self):
+        self._entries = defaultdict(list)
+        self._longest = defaultdict(timedelta)
+
+    def add(self, key, start, end, ref=None):
+        insort(self._entries[key], (start, end, ref))
+        self._longest[key] = max(self._longest[key], end - start)
+
+    def extend(self, items):
+        """Add many ``(key, start, end, ref)`` items, sorting each key once."""
+        touched = set()
+        for key, start, end, ref in items:
+            self._entries[key].append((start, end, ref))
+            self._longest[key] = max(self._longest[key], end - start)
+            touched.add(key)
+        for key in touched:
+            self._entries[key].sort()
+
+    def overlapping(self, key, start, end, exclude=None):
+        """``(start, end, ref)`` entries of ``key`` overlapping ``[start, end)``."""
+        entries = self._entries.get(key)
+        if not entries:
+            return []
+        # Nothing starting at or before ``earliest`` can still be running at ``start``.
+        earliest = start - self._longest[key]
+        found = []
+        position = bisect_left(entries, (end,)) - 1
+        while position >= 0 and entries[position][0] > earliest:
+            entry = entries[position]
+            if entry[1] > start and (exclude is None or entry[2] != exclude):
+                found.append(entry)
+            position -= 1
+        return found[::-1]
+
+    def first_free(self, keys, start, duration, exclude=None):
+        """The earliest start at or after ``start`` free for every key."""
+        while True:
+            end = start + duration
+            blocking = [entry for key in keys for entry in self.overlapping(key, start, end, exclude)]
+            if not blocking:
+                return start
+            start = max(entry[1] for entry in blocking)
+
+
+class InterviewCalendar:
+    """Conflict checks and free-slot search over the interviews in a time window."""
+
+    def __init__(self, window_start=None, window_end=None, exclude=None):
+        self.index = IntervalIndex()
+        queryset = Interview.objects.filter(status__in=BLOCKING_STATUSES)
+        if exclude is not None:
+            queryset = queryset.exclude(pk=exclude)
+        if window_start is not None:
+            # Earlier interviews have ended before the window opens.
+            queryset = queryset.filter(date_time__gt=window_start - timedelta(minutes=MAX_INTERVIEW_MINUTES))
+        if window_end is not None:
+            queryset = queryset.filter(date_time__lt=window_end)
+        rows = queryset.values_list(
+            'id', 'date_time', 'duration_minutes', 'interview_type', 'location', 'zoom_link', 'application__intern_id',
+        )
+        self.index.extend(
+            (key, date_time, date_time + timedelta(minutes=minutes), pk)
+            for pk, date_time, minutes, interview_type, location, zoom_link, intern_id in rows.iterator()
+            for key in interview_keys(interview_type, location, zoom_link, intern_id)
+        )
+
+    def add(self, keys, start, duration, ref=None):
+        for key in keys:
+            self.index.add(key, start, start + duration, ref)
+
+    def conflicts(self, keys, start, duration, exclude=None):
+        """``{key: [(start, end, interview id)]}`` for every key booked during the slot."""
+        end = start + duration
+        found = {}
+        for key in keys:
+            entries = self.index.overlapping(key, start, end, exclude)
+            if entries:
+                found[key] = entries
+        return found
+
+    def next_free_slot(self, keys, after, duration):
+        """The first slot at or after ``after`` that is free for ``keys`` and within working hours."""
+        start = align_to_working_hours(after, duration)
+        while True:
+            candidate = self.index.first_free(keys, start, duration)
+            aligned = align_to_working_hours(candidate, duration)
+            if aligned == candidate:
+                return Slot(candidate, candidate + duration)
+            start = aligned
+
+    def first_fit(self, keys, windows, duration):
+        """The earliest on-grid slot inside one of ``windows`` that is free for ``keys``."""
+        for window in windows:
+            start = round_to_slot(window.start)
+            while start + duration <= window.end:
+                free = self.index.first_free(keys, start, duration)
+                if free == start:
+                    return Slot(start, start + duration)
+                start = round_to_slot(free)
+        return None
+
+
+def working_hours():
+    start, end = getattr(settings, 'INTERVIEW_WORKING_HOURS', (9, 17))
+    return time(start), time(end)
+
+
+def round_to_slot(moment):
+    """Round ``moment`` up to the next multiple of SLOT_STEP_MINUTES, in local time."""
+    moment = timezone.localtime(moment)
+    step = timedelta(minutes=SLOT_STEP_MINUTES)
+    midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    remainder = (moment - midnight) % step
+    return moment + (step - remainder) if remainder else moment
+
+
+def align_to_working_hours(moment, duration):
+    """Round ``moment`` up to the slot grid and into the next working-day window.
+
+    Raises ValueError when ``duration`` is longer than the working day, as
+    no day could ever hold it.
+    """
+    day_start, day_end = working_hours()
+    if datetime.combine(moment.date(), day_start) + duration > datetime.combine(moment.date(), day_end):
+        raise ValueError(
+            f"A {duration.total_seconds() / 60:.0f} minute interview does not fit in the working day "
+            f"({day_start:%H:%M}-{day_end:%H:%M})."
+        )
+    moment = round_to_slot(moment)
+
+    while True:
+        opens = moment.replace(hour=day_start.hour, minute=day_start.minute, second=0, microsecond=0)
+        closes = moment.replace(hour=day_end.hour, minute=day_end.minute, second=0, microsecond=0)
+        if moment.weekday() < 5:
+            if moment < opens:
+                moment = opens
+            if moment + duration <= closes:
+                return moment
+        moment = timezone.make_aware(datetime.combine(moment.date() + timedelta(days=1), day_start))
+
+
+def find_conflicts(interview_type, location, zoom_link, intern_id, start, minutes, exclude=None):
+    """Human-readable conflicts for a proposed interview, [] when the slot is free."""
+    duration = timedelta(minutes=minutes)
+    calendar = InterviewCalendar(start, start + duration, exclude=exclude)
+    found = calendar.conflicts(interview_keys(interview_type, location, zoom_link, intern_id), start, duration)
+    messages = []
+    for (kind, _), entries in found.items():
+        times = ', '.join(timezone.localtime(other_start).strftime('%b %d %H:%M') for other_start, _, _ in entries)
+        if kind == 'candidate':
+            messages.append(f"The candidate already has an interview at {times}.")
+        elif kind == 'location':
+            messages.append(f"This location is already booked at {times}.")
+        else:
+            messages.append(f"This Zoom meeting is already in use at {times}.")
+    return messages
+
+
+def interview_scheduled_email(interview):
+    application = interview.application
+    user = application.intern.user
+    start = timezone.localtime(interview.date_time)
+    context = {
+        'user': user,
+        'offer': application.internship_offer,
+        'interview_date': start.strftime("%A, %B %d, %Y"),
+        'interview_time': start.strftime("%I:%M %p"),
+        'interview_type': interview.get_interview_type_display(),
+        'zoom_link': interview.zoom_link,
+        'location': interview.location,
+    }
+    return build_email("Interview Scheduled", 'emails/interview_scheduled.html', context, [user.email])
+
+
+def plan_interviews(calendar, applications, windows, duration, interview_type, rooms):
+    """Greedily give each application, in order, the earliest free slot in any room.
+
+    ``rooms`` are locations for in-person interviews and meeting links for
+    Zoom ones; a slot must be free for both the room and the candidate.
+    Returns ``(planned, unplanned)`` where ``planned`` is
+    ``[(application, room, slot)]``.
+    """
+    windows = sorted(windows)
+    room_keys = [(room, location_key(interview_type, room, room)) for room in rooms]
+    planned, unplanned = [], []
+    for application in applications:
+        best = None
+        for room, room_key in room_keys:
+            keys = [room_key, candidate_key(application.intern_id)]
+            slot = calendar.first_fit(keys, windows, duration)
+            if slot and (best is None or slot.start < best[2].start):
+                best = (room, keys, slot)
+        if best is None:
+            unplanned.append(application)
+            continue
+        room, keys, slot = best
+        calendar.add(keys, slot.start, duration)
+        planned.append((application, room, slot))
+    return planned, unplanned
+
+
+@dataclass
+class ScheduleResult:
+    interviews: list = field(default_factory=list)
+    unscheduled_ids: list = field(default_factory=list)
+    skipped: int = 0
+
+    def __len__(self):
+        return len(self.interviews)
+
+
+def unscheduled_applications():
+    """Approved applications that still need an interview.
+
+    Applications whose interview was moved to the archive table have been
+    interviewed already and are left out.
+    """
+    return InternshipApplication.objects.filter(
+        status='approved', interview__isnull=True, archived_interviews__isnull=True,
+    )
+
+
+def schedule_interviews(application_ids, windows, minutes, interview_type, rooms):
+    """Create interviews for the approved applications among ``application_ids``.
+
+    Applications are served first come, first served. Interviews are
+    inserted with one bulk_create, which sends no post_save signal, so the
+    "Interview Scheduled" emails are queued here in one batch as well.
+    Applications that are not approved or already have an interview are
+    skipped; those that found no free slot are returned as unscheduled.
+    """
+    duration = timedelta(minutes=minutes)
+    windows = sorted(windows)
+    with transaction.atomic():
+        applications = list(
+            unscheduled_applications()
+            .select_for_update(of=('self',))
+            .filter(id__in=application_ids)
+            .select_related('intern__user', 'internship_offer')
+            .order_by('applied_at', 'id')
+        )
+        calendar = InterviewCalendar(windows[0].start, windows[-1].end)
+        planned, unplanned = plan_interviews(calendar, applications, windows, duration, interview_type, rooms)
+        interviews = Interview.objects.bulk_create([
+            Interview(
+                application=application,
+                date_time=slot.start,
+                duration_minutes=minutes,
+                interview_type=interview_type,
+                location=room if interview_type == 'in_person' else None,
+                zoom_link=room if interview_type == 'zoom' else '',
+            )
+            for application, room, slot in planned
+        ])
+        queue_emails([interview_scheduled_email(interview) for interview in interviews if interview.application.intern.user.email])
+        if interviews:
+            invalidate_dashboard_metrics()
+            invalidate_intern_summaries(application.intern_id for application, _, _ in planned)
+    return ScheduleResult(
+        interviews=interviews,
+        unscheduled_ids=[application.id for application in unplanned],
+        skipped=len(set(application_ids)) - len(applications),
+    )
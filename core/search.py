@@ -0,0 +1,285 @@
+import re
+from dataclasses import dataclass
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count, Q, Window
+from django.db.models.expressions import RawSQL
+
+from .models import CVDocument, InternshipOffer
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+POSTGRES_SEARCH_COLUMN = 'search_document'
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """A full-text index over ``columns`` of ``content_table``.
+
+    ``key`` is the content table column holding the primary key of the
+    model being searched, so matches can be applied to its querysets.
+    Weights are bm25() weights on SQLite and setweight() classes on
+    PostgreSQL, one per column.
+    """
+
+    content_table: str
+    key: str
+    columns: tuple
+    sqlite_weights: tuple
+    postgres_weights: tuple
+    fallback_lookups: tuple
+    ordering: tuple
+
+    @property
+    def sqlite_table(self):
+        return f'{self.content_table}_fts'
+
+    @property
+    def postgres_index(self):
+        return f'{self.content_table}_search_gin'
+
+
+OFFER_INDEX = SearchIndex(
+    content_table=InternshipOffer._meta.db_table,
+    key='id',
+    columns=('title', 'description', 'requirements'),
+    sqlite_weights=(10.0, 1.0, 5.0),
+    postgres_weights=('A', 'C', 'B'),
+    fallback_lookups=('title__icontains', 'description__icontains', 'requirements__icontains'),
+    ordering=('-start_date', '-id'),
+)
+
+CV_INDEX = SearchIndex(
+    content_table=CVDocument._meta.db_table,
+    key='intern_id',
+    columns=('text',),
+    sqlite_weights=(1.0,),
+    postgres_weights=('A',),
+    fallback_lookups=('cv_document__text__icontains',),
+    ordering=('-id',),
+)
+
+INDEXES = (OFFER_INDEX, CV_INDEX)
+
+
+def _page(rows):
+    """``(ids, total)`` from ``(pk, total)`` rows; total is None for an empty page."""
+    return [row[0] for row in rows], rows[0][1] if rows else None
+
+
+def _slice(queryset, offset, limit):
+    return queryset[offset:None if limit is None else offset + limit]
+
+
+class SearchResults:
+    """The ranked pks of ``queryset`` matching ``query``, fetched a slice at a time.
+
+    Slicing runs the ranked query with LIMIT/OFFSET, and the page query
+    also counts every match, so a paginator's slice-then-len() costs one
+    query without loading the other pages.
+    """
+
+    def __init__(self, backend, queryset, query, index):
+        self.backend = backend
+        self.queryset = queryset
+        self.query = query
+        self.index = index
+        self._total = None
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice) or item.step is not None:
+            raise TypeError('Search results only support slices.')
+        offset = item.start or 0
+        limit = None if item.stop is None else max(item.stop - offset, 0)
+        ids, total = self.backend.ranked_page(self.queryset, self.query, self.index, offset, limit)
+        if total is not None or offset == 0:
+            self._total = total or 0
+        return ids
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __len__(self):
+        if self._total is None:
+            # Only a slice past the last match gets here.
+            self._total = self.backend.ranked_page(self.queryset, self.query, self.index, 0, 1)[1] or 0
+        return self._total
+
+
+class IContainsBackend:
+    """Fallback for databases without a full-text engine: no index, no ranking."""
+
+    @classmethod
+    def is_supported(cls, connection):
+        return True
+
+    def install(self, connection, index):
+        pass
+
+    def ranked_page(self, queryset, query, index, offset=0, limit=None):
+        condition = Q()
+        for lookup in index.fallback_lookups:
+            condition |= Q(**{lookup: query})
+        rows = (
+            queryset.filter(condition)
+            .annotate(search_total=Window(Count('*')))
+            .order_by(*index.ordering)
+            .values_list('pk', 'search_total')
+        )
+        return _page(list(_slice(rows, offset, limit)))
+
+
+class SQLiteFTSBackend:
+    """SQLite FTS5 external-content tables kept in sync by triggers."""
+
+    @classmethod
+    def is_supported(cls, connection):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA compile_options')
+            return 'ENABLE_FTS5' in {row[0] for row in cursor.fetchall()}
+
+    def install(self, connection, index):
+        table = index.sqlite_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+                [f'{table}%'],
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            expected = {table} | {f'{table}_{suffix}' for suffix in ('ai', 'ad', 'au')}
+            if expected <= existing:
+                return
+
+            # Table rebuilds during migrations drop the triggers, so they are
+            # (re)created here and the index is rebuilt from the content table.
+            columns = ', '.join(index.columns)
+            new_values = ', '.join(f'new.{column}' for column in index.columns)
+            old_values = ', '.join(f'old.{column}' for column in index.columns)
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                f"{columns}, "
+                f"content='{index.content_table}', content_rowid='{index.key}', tokenize='porter unicode61')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {index.content_table} BEGIN "
+                f"INSERT INTO {table}(rowid, {columns}) VALUES (new.{index.key}, {new_values}); "
+                f"END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {index.content_table} BEGIN "
+                f"INSERT INTO {table}({table}, rowid, {columns}) "
+                f"VALUES ('delete', old.{index.key}, {old_values}); "
+                f"END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {columns} ON {index.content_table} BEGIN "
+                f"INSERT INTO {table}({table}, rowid, {columns}) "
+                f"VALUES ('delete', old.{index.key}, {old_values}); "
+                f"INSERT INTO {table}(rowid, {columns}) VALUES (new.{index.key}, {new_values}); "
+                f"END"
+            )
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+    def match_expression(self, query):
+        # Quote every word so user input can never be parsed as FTS syntax,
+        # and prefix-match the words so partially typed terms still hit.
+        words = WORD_RE.findall(query)
+        return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+    def ranked_page(self, queryset, query, index, offset=0, limit=None):
+        match = self.match_expression(query)
+        if not match:
+            return [], 0
+        table = index.sqlite_table
+        weights = ', '.join(str(weight) for weight in index.sqlite_weights)
+        # One statement: the caller's filters (department, duration, ...)
+        # restrict the matched rows inside the ranked FTS query itself.
+        # bm25() cannot share a SELECT with a window function, so the
+        # matches are scored in a subquery and counted and paged outside it.
+        allowed, allowed_params = queryset.order_by().values('pk').query.sql_with_params()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                f"SELECT id, COUNT(*) OVER () FROM ("
+                f"SELECT rowid AS id, bm25({table}, {weights}) AS score FROM {table} "
+                f"WHERE {table} MATCH %s AND rowid IN ({allowed})"
+                f") ORDER BY score, id LIMIT %s OFFSET %s",
+                [match, *allowed_params, -1 if limit is None else limit, offset],
+            )
+            return _page(cursor.fetchall())
+
+
+class PostgresSearchBackend:
+    """Stored generated tsvector columns with GIN indexes."""
+
+    config = 'english'
+
+    @classmethod
+    def is_supported(cls, connection):
+        return True
+
+    def install(self, connection, index):
+        document = ' || '.join(
+            f"setweight(to_tsvector('{self.config}', coalesce({column}, '')), '{weight}')"
+            for column, weight in zip(index.columns, index.postgres_weights)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {index.content_table} ADD COLUMN IF NOT EXISTS {POSTGRES_SEARCH_COLUMN} tsvector "
+                f"GENERATED ALWAYS AS ({document}) STORED"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {index.postgres_index} "
+                f"ON {index.content_table} USING GIN ({POSTGRES_SEARCH_COLUMN})"
+            )
+
+    def ranked_page(self, queryset, query, index, offset=0, limit=None):
+        tsquery = f"websearch_to_tsquery('{self.config}', %s)"
+        matches = f"SELECT {index.key} FROM {index.content_table} WHERE {POSTGRES_SEARCH_COLUMN} @@ {tsquery}"
+        model_table = queryset.model._meta.db_table
+        if index.content_table == model_table:
+            rank = f"ts_rank({model_table}.{POSTGRES_SEARCH_COLUMN}, {tsquery})"
+        else:
+            rank = (
+                f"(SELECT ts_rank({POSTGRES_SEARCH_COLUMN}, {tsquery}) FROM {index.content_table} "
+                f"WHERE {index.content_table}.{index.key} = {model_table}.{queryset.model._meta.pk.column})"
+            )
+        rows = (
+            queryset.filter(pk__in=RawSQL(matches, [query]))
+            .annotate(search_rank=RawSQL(rank, [query]), search_total=Window(Count('*')))
+            .order_by('-search_rank', *index.ordering)
+            .values_list('pk', 'search_total')
+        )
+        return _page(list(_slice(rows, offset, limit)))
+
+
+BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+_backends = {}
+
+
+def get_backend(using=DEFAULT_DB_ALIAS):
+    if using not in _backends:
+        connection = connections[using]
+        backend_class = BACKENDS.get(connection.vendor, IContainsBackend)
+        if not backend_class.is_supported(connection):
+            backend_class = IContainsBackend
+        _backends[using] = backend_class()
+    return _backends[using]
+
+
+def install_search_index(using=DEFAULT_DB_ALIAS):
+    backend = get_backend(using)
+    for index in INDEXES:
+        backend.install(connections[using], index)
+
+
+def search_offers(queryset, query):
+    """Return the pks of the offers in ``queryset`` matching ``query``, best match first."""
+    return SearchResults(get_backend(queryset.db), queryset, query, OFFER_INDEX)
+
+
+def search_interns(queryset, query):
+    """Return the pks of the interns in ``queryset`` whose CV text matches ``query``."""
+    return SearchResults(get_backend(queryset.db), queryset, query, CV_INDEX)
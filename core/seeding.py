@@ -0,0 +1,154 @@
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import invalidate_dashboard_metrics
+from .models import Intern, InternshipApplication, InternshipOffer, Interview
+
+BATCH_SIZE = 5000
+BENCH_PASSWORD = 'bench-password'
+
+DEPARTMENTS = ['IT', 'Data', 'Marketing', 'Finance', 'Human Resources', 'Design', 'Sales', 'Operations']
+ROLES = ['Backend Developer', 'Frontend Developer', 'Data Analyst', 'ML Engineer', 'DevOps', 'UX Designer',
+         'Marketing Assistant', 'Financial Analyst', 'Recruiter', 'Business Analyst', 'QA Engineer', 'Sales Associate']
+SKILLS = ['Python', 'Django', 'JavaScript', 'React', 'SQL', 'Docker', 'Kubernetes', 'Excel', 'Figma', 'Pandas',
+          'Machine Learning', 'Communication', 'Git', 'Linux', 'Java', 'Tableau', 'SEO', 'Accounting']
+FIRST_NAMES = ['Amira', 'Youssef', 'Lina', 'Omar', 'Sara', 'Mehdi', 'Nour', 'Karim', 'Ines', 'Adam', 'Maya', 'Rami']
+LAST_NAMES = ['Ben Ali', 'Trabelsi', 'Haddad', 'Jaziri', 'Mansour', 'Gharbi', 'Khelifi', 'Saidi', 'Bouaziz', 'Chebbi']
+DURATIONS = [('2 months', 60), ('3 months', 90), ('6 months', 180), ('1 year', 365)]
+
+# Share of applications per status; interviews are only given to approved ones.
+APPLICATION_STATUS_WEIGHTS = {'pending': 5, 'approved': 3, 'refused': 2}
+
+
+@dataclass
+class SeedResult:
+    users: int = 0
+    offers: int = 0
+    applications: int = 0
+    interviews: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows(self):
+        # Each user also gets an Intern row.
+        return self.users * 2 + self.offers + self.applications + self.interviews
+
+
+def _offer(rng, today):
+    title = rng.choice(ROLES)
+    duration, days = rng.choice(DURATIONS)
+    start = today + timedelta(days=rng.randint(-365, 120))
+    skills = rng.sample(SKILLS, 4)
+    return InternshipOffer(
+        title=f'{title} Intern',
+        description=f'Join our team as a {title.lower()} intern and work with {", ".join(skills[:2])} on real projects.',
+        department=rng.choice(DEPARTMENTS),
+        duration=duration,
+        duration_days=days,
+        requirements=', '.join(skills),
+        start_date=start,
+        end_date=start + timedelta(days=days),
+    )
+
+
+def _interview(rng, application, now):
+    moment = application.applied_at + timedelta(days=rng.randint(3, 30), hours=rng.randint(0, 8))
+    if moment > now:
+        status = 'scheduled'
+    else:
+        status = rng.choices(['completed', 'cancelled', 'no_show'], weights=[8, 1, 1])[0]
+    kind = rng.choice(['zoom', 'in_person'])
+    return Interview(
+        application=application,
+        date_time=moment.replace(minute=0, second=0, microsecond=0),
+        interview_type=kind,
+        zoom_link='https://zoom.example.com/j/bench' if kind == 'zoom' else '',
+        location='Main office, room 2' if kind == 'in_person' else None,
+        status=status,
+        feedback='Completed as scheduled.' if status == 'completed' else None,
+    )
+
+
+def seed(interns, offers=None, applications_per_intern=3, interview_ratio=0.5, batch_size=BATCH_SIZE,
+         random_seed=0, prefix='bench', progress=None):
+    """Bulk-insert a synthetic but realistically shaped data set.
+
+    Rows are inserted with bulk_create, so no signals run; the dashboard
+    cache is invalidated at the end. The same ``random_seed`` always yields
+    the same data shape. ``interview_ratio`` is the share of approved
+    applications that get an interview.
+    """
+    rng = random.Random(random_seed)
+    result = SeedResult()
+    started = time.perf_counter()
+    today = date.today()
+    now = timezone.now()
+    status_names, status_weights = zip(*APPLICATION_STATUS_WEIGHTS.items())
+    # Hashing is deliberately slow; every bench user shares one hash.
+    password = make_password(BENCH_PASSWORD)
+    User.objects.get_or_create(
+        username=f'{prefix}-admin',
+        defaults={'email': f'{prefix}-admin@example.com', 'password': password, 'is_staff': True, 'is_superuser': True},
+    )
+    offset = User.objects.filter(username__startswith=f'{prefix}-', is_staff=False).count()
+
+    offer_count = offers if offers is not None else max(50, interns // 20)
+    offer_ids = []
+    for start in range(0, offer_count, batch_size):
+        created = InternshipOffer.objects.bulk_create(
+            [_offer(rng, today) for _ in range(min(batch_size, offer_count - start))]
+        )
+        offer_ids.extend(offer.id for offer in created)
+    result.offers = len(offer_ids)
+
+    for start in range(0, interns, batch_size):
+        size = min(batch_size, interns - start)
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(
+                    username=f'{prefix}-{offset + start + number}',
+                    email=f'{prefix}-{offset + start + number}@example.com',
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    password=password,
+                    date_joined=now - timedelta(days=rng.randint(0, 730)),
+                )
+                for number in range(size)
+            ])
+            profiles = Intern.objects.bulk_create([Intern(user=user) for user in users])
+
+            applications = []
+            for profile, user in zip(profiles, users):
+                count = min(len(offer_ids), rng.randint(0, applications_per_intern * 2))
+                for offer_id in rng.sample(offer_ids, count):
+                    applications.append(InternshipApplication(
+                        intern=profile,
+                        internship_offer_id=offer_id,
+                        status=rng.choices(status_names, weights=status_weights)[0],
+                        applied_at=min(now, user.date_joined + timedelta(days=rng.randint(0, 60), seconds=rng.randint(0, 86399))),
+                    ))
+            applications = InternshipApplication.objects.bulk_create(applications, batch_size=batch_size)
+            interviews = Interview.objects.bulk_create(
+                [
+                    _interview(rng, application, now) for application in applications
+                    if application.status == 'approved' and rng.random() < interview_ratio
+                ],
+                batch_size=batch_size,
+            )
+
+        result.users += len(users)
+        result.applications += len(applications)
+        result.interviews += len(interviews)
+        if progress:
+            progress(result)
+
+    invalidate_dashboard_metrics()
+    result.seconds = time.perf_counter() - started
+    return result
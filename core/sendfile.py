@@ -0,0 +1,124 @@
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+
+from .storage import sha256_from_name
+
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def file_etag(name, size, last_modified):
+    # Content-addressed names already are the content hash.
+    digest = sha256_from_name(name)
+    if digest:
+        return f'"{digest}"'
+    return f'"{size:x}-{int(last_modified.timestamp()):x}"'
+
+
+def _parse_range(match, size):
+    """Return ``(start, end)`` for a satisfiable byte range, else None."""
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+def _iter_range(file, start, length):
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _offload_headers(storage, name):
+    """Headers handing the transfer to the front-end server, if configured."""
+    backend = getattr(settings, 'SENDFILE_BACKEND', None)
+    if backend == 'x-accel-redirect':
+        prefix = getattr(settings, 'SENDFILE_URL_PREFIX', '/protected/')
+        return {'X-Accel-Redirect': prefix.rstrip('/') + '/' + quote(name)}
+    if backend == 'x-sendfile':
+        try:
+            return {'X-Sendfile': storage.path(name)}
+        except NotImplementedError:
+            return None
+    return None
+
+
+def sendfile_response(request, storage, name, filename):
+    """Serve ``name`` from ``storage`` as a private, revalidated download.
+
+    Conditional requests are answered with 304 from the file's metadata.
+    With ``SENDFILE_BACKEND`` set, only headers are returned and nginx
+    (X-Accel-Redirect) or Apache/lighttpd (X-Sendfile) sends the bytes;
+    otherwise the file is returned with FileResponse, honouring single
+    byte ranges.
+    """
+    size = storage.size(name)
+    last_modified = storage.get_modified_time(name)
+    etag = file_etag(name, size, last_modified)
+    last_modified_ts = int(last_modified.timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if response is None:
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        offload = _offload_headers(storage, name)
+        if offload:
+            # The front-end server fills in the body, length and ranges.
+            response = HttpResponse(content_type=content_type)
+            for header, value in offload.items():
+                response[header] = value
+        else:
+            response = _file_response(request, storage, name, size, etag, last_modified_ts, content_type)
+        response['Content-Disposition'] = f"inline; filename*=UTF-8''{quote(filename)}"
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified_ts)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _file_response(request, storage, name, size, etag, last_modified_ts, content_type):
+    byte_range = None
+    # Multiple or malformed ranges are ignored and the whole file is sent.
+    match = RANGE_HEADER.match(request.META.get('HTTP_RANGE', '').strip())
+    if match:
+        if_range = request.META.get('HTTP_IF_RANGE', '').strip()
+        if not if_range or if_range == etag or parse_http_date_safe(if_range) == last_modified_ts:
+            byte_range = _parse_range(match, size)
+            if byte_range is None:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+
+    if byte_range is None:
+        response = FileResponse(storage.open(name, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_range(storage.open(name, 'rb'), start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -1,10 +1,12 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, post_migrate
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
-from django.conf import settings
-from .models import Intern, Interview
+from .models import Intern, Interview, InternshipApplication, InternshipOffer
+from .backends import invalidate_cached_user
+from .counters import invalidate_dashboard_metrics, invalidate_intern_summaries
+from .search import install_search_index
+from .outbox import queue_emails
+from .scheduling import interview_scheduled_email
 
 
 @receiver(post_save, sender=User)
@@ -13,38 +15,52 @@ def create_intern_profile(sender, instance, created, **kwargs):
         Intern.objects.create(user=instance)
 
 @receiver(post_save, sender=User)
-def save_intern_profile(sender, instance, **kwargs):
-    if not instance.is_staff and not instance.is_superuser:
-        try:
-            instance.intern.save()
-        except Intern.DoesNotExist:
-             Intern.objects.create(user=instance)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+@receiver(post_save, sender=Intern)
+@receiver(post_delete, sender=Intern)
+def invalidate_profile_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
 
 @receiver(post_save, sender=Interview)
 def send_interview_email(sender, instance, created, **kwargs):
     if created and instance.status == 'scheduled' and instance.application:
-        user = instance.application.intern.user
-        if not user.email:
-            return
-
-        context = {
-            'user': user,
-            'offer': instance.application.internship_offer,
-            'interview_date': instance.date_time.strftime("%A, %B %d, %Y"),
-            'interview_time': instance.date_time.strftime("%I:%M %p"),
-            'interview_type': instance.get_interview_type_display(),
-            'zoom_link': instance.zoom_link,
-            'location': instance.location,
-        }
-
-        subject = "Interview Scheduled"
-        html_body = render_to_string('emails/interview_scheduled.html', context)
-
-        email = EmailMessage(
-            subject=subject,
-            body=html_body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[user.email]
+        if instance.application.intern.user.email:
+            queue_emails([interview_scheduled_email(instance)])
+
+@receiver(post_save, sender=InternshipApplication)
+@receiver(post_delete, sender=InternshipApplication)
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+@receiver(post_save, sender=Intern)
+@receiver(post_delete, sender=Intern)
+@receiver(post_save, sender=InternshipOffer)
+@receiver(post_delete, sender=InternshipOffer)
+def invalidate_dashboard_counters(sender, **kwargs):
+    invalidate_dashboard_metrics()
+
+@receiver(post_save, sender=InternshipApplication)
+@receiver(post_delete, sender=InternshipApplication)
+def invalidate_application_intern_summary(sender, instance, **kwargs):
+    invalidate_intern_summaries([instance.intern_id])
+
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+def invalidate_interview_intern_summary(sender, instance, **kwargs):
+    if instance.application_id:
+        invalidate_intern_summaries(
+            InternshipApplication.objects.filter(id=instance.application_id).values_list('intern_id', flat=True)
         )
-        email.content_subtype = "html"
-        email.send(fail_silently=True)
\ No newline at end of file
+
+@receiver(post_save, sender=InternshipOffer)
+def invalidate_offer_intern_summaries(sender, instance, created, **kwargs):
+    # Offer titles and departments are part of every applicant's summary.
+    if not created:
+        invalidate_intern_summaries(instance.applications.values_list('intern_id', flat=True))
+
+@receiver(post_migrate)
+def create_search_indexes(sender, using, **kwargs):
+    if sender.name == 'core':
+        install_search_index(using)
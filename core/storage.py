@@ -0,0 +1,140 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+from django.core.files.uploadhandler import SkipFile, StopUpload, TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from django.utils.deconstruct import deconstructible
+
+CV_EXTENSIONS = ['pdf', 'doc', 'docx', 'odt', 'rtf', 'txt']
+CV_MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+# Room for the multipart boundaries, headers and the other form fields.
+MULTIPART_OVERHEAD = 64 * 1024
+
+SHA256_NAME = re.compile(r'^[0-9a-f]{64}$')
+
+_default_cv_storage = None
+
+
+def get_max_cv_size():
+    return getattr(settings, 'CV_MAX_UPLOAD_SIZE', CV_MAX_UPLOAD_SIZE)
+
+
+def validate_cv_size(value):
+    if value.size > get_max_cv_size():
+        raise ValidationError(f"CV files must be smaller than {filesizeformat(get_max_cv_size())}.")
+
+
+def file_sha256(content):
+    # Uploads that went through CVUploadHandler were hashed while streaming.
+    digest = getattr(content, 'content_sha256', None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def sha256_from_name(name):
+    """The content hash encoded in a content-addressed name, or None."""
+    stem = os.path.splitext(posixpath.basename(name))[0]
+    return stem if SHA256_NAME.match(stem) else None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Store every file under the SHA-256 of its content.
+
+    ``cvs/report.pdf`` is saved as ``cvs/ab/ab12...ef.pdf``. Saving content
+    that is already stored returns the existing name without writing, so
+    identical files share one blob. Blobs are never overwritten or deleted
+    on save; unreferenced ones are removed by ``manage.py gc_cvs``.
+
+    A reused blob is touched, so ``gc_cvs --min-age`` treats it as a fresh
+    upload even if nothing referenced it until now.
+    """
+
+    def hashed_name(self, name, digest):
+        directory, filename = posixpath.split(name.replace('\\', '/'))
+        extension = os.path.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        name = self.hashed_name(name, file_sha256(content))
+        if self.exists(name):
+            os.utime(self.path(name))
+            return name
+        return self._save(name, content).replace('\\', '/')
+
+
+def get_cv_storage():
+    """Storage for Intern.cv; a ``cvs`` entry in STORAGES takes precedence.
+
+    Referenced from the model as a callable so migrations don't depend on
+    deployment settings.
+    """
+    global _default_cv_storage
+    if 'cvs' in settings.STORAGES:
+        return storages['cvs']
+    if _default_cv_storage is None:
+        _default_cv_storage = ContentAddressedStorage()
+    return _default_cv_storage
+
+
+class CVUploadHandler(TemporaryFileUploadHandler):
+    """Stream CV uploads to a temporary file while hashing them.
+
+    The type is checked from the part headers and the size as chunks
+    arrive, so rejected uploads are abandoned before the rest of the body
+    is read. The reason is kept in ``error`` for the view to report.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = get_max_cv_size()
+        self.error = None
+        self.request_size = None
+        self.received = 0
+        self.hasher = None
+
+    def _too_large(self):
+        self.error = f"CV files must be smaller than {filesizeformat(self.max_size)}."
+        # Stop reading the body instead of draining it.
+        raise StopUpload(connection_reset=True)
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.request_size = content_length
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        if self.request_size and self.request_size > self.max_size + MULTIPART_OVERHEAD:
+            self._too_large()
+        extension = os.path.splitext(file_name or '')[1].lower().lstrip('.')
+        if extension not in CV_EXTENSIONS:
+            self.error = f"Unsupported file type. Allowed types: {', '.join(CV_EXTENSIONS)}."
+            raise SkipFile()
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.received = 0
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self._too_large()
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        upload = super().file_complete(file_size)
+        upload.content_sha256 = self.hasher.hexdigest()
+        return upload
@@ -1,3 +1,644 @@
-from django.test import TestCase
+import io
+import json
+import os
+import re
+import tempfile
+import time
+from unittest import mock
+from datetime import date, datetime, time as clock, timedelta
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .archival import move_interviews
+from .benchmark import HOT_URL_NAMES, compare, compare_interfaces, run_benchmark, serving_async_views
+from .counters import get_cache
+from .models import ArchivedInterview, Intern, InternshipOffer, InternshipApplication, Interview, OutgoingEmail, parse_duration_days
+from .offer_import import import_offers
+from .pagination import CursorPaginator, SequenceCursorPaginator, encode_cursor
+from .outbox import RETRY_BASE_SECONDS, claim_batch, queue_emails, send_pending
+from .query_budget import QueryBudgetExceeded, query_budget
+from .forms import InterviewAdminForm
+from .scheduling import IntervalIndex, InterviewCalendar, Slot, schedule_interviews, unscheduled_applications
+from .search import IContainsBackend, get_backend, search_offers
+from .seeding import seed
+from .transitions import InvalidTransition, transition_applications, transition_interviews
+
+
+class ListQueryCountTests(TestCase):
+    list_urls = [
+        reverse('admin_interns_list'),
+        reverse('admin_interviews_list'),
+        reverse('admin_offers_list'),
+        reverse('admin:core_intern_changelist'),
+        reverse('admin:core_internshipoffer_changelist'),
+        reverse('admin:core_interview_changelist'),
+    ]
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.admin)
+        self.created = 0
+
+    def add_rows(self, count):
+        for _ in range(count):
+            self.created += 1
+            n = self.created
+            user = User.objects.create_user(f'intern{n}', f'intern{n}@example.com', 'password')
+            offer = InternshipOffer.objects.create(
+                title=f'Offer {n}',
+                department='IT',
+                duration='3 months',
+                requirements='Python',
+                start_date=date.today() + timedelta(days=30),
+            )
+            application = InternshipApplication.objects.create(intern=user.intern, internship_offer=offer)
+            Interview.objects.create(
+                application=application,
+                date_time=timezone.now() + timedelta(days=n),
+                interview_type='zoom',
+                zoom_link='https://zoom.example.com/j/1',
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_rows(2)
+        baseline = {url: self.count_queries(url) for url in self.list_urls}
+        self.add_rows(8)
+        for url in self.list_urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.count_queries(url), baseline[url])
+
+
+class BenchmarkTests(TestCase):
+    def test_seed_creates_linked_rows(self):
+        result = seed(30, offers=10, batch_size=12, random_seed=1)
+        self.assertEqual(Intern.objects.filter(user__username__startswith='bench-').count(), 30)
+        self.assertEqual(InternshipOffer.objects.count(), 10)
+        self.assertEqual(InternshipApplication.objects.count(), result.applications)
+        self.assertEqual(Interview.objects.count(), result.interviews)
+        self.assertFalse(Interview.objects.exclude(application__status='approved').exists())
+        self.assertTrue(User.objects.filter(username='bench-admin', is_staff=True).exists())
+
+    def test_every_url_responds(self):
+        seed(20, offers=5, random_seed=2)
+        report = run_benchmark(iterations=1, warmup=0)
+        self.assertIn('admin_dashboard', report['views'])
+        self.assertIn('dashboard', report['views'])
+        for name, result in report['views'].items():
+            with self.subTest(view=name):
+                self.assertLess(result['status'], 500)
+
+    def test_compare_reports_slower_views_and_extra_queries(self):
+        baseline = {'views': {
+            'fast': {'p95_ms': 10.0, 'queries': 3},
+            'steady': {'p95_ms': 10.0, 'queries': 3},
+            'jitter': {'p95_ms': 1.0, 'queries': 3},
+        }}
+        current = {'views': {
+            'fast': {'p95_ms': 20.0, 'queries': 4},
+            'steady': {'p95_ms': 11.0, 'queries': 3},
+            'jitter': {'p95_ms': 2.0, 'queries': 3},
+            'new': {'p95_ms': 500.0, 'queries': 50},
+        }}
+        regressions = compare(baseline, current, threshold=0.25, min_delta_ms=2.0)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(message.startswith('fast:') for message in regressions))
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        seed(25, offers=8, random_seed=3)
+        self.staff = User.objects.get(username='bench-admin')
+        self.intern = Intern.objects.filter(applications__isnull=False).select_related('user').first()
+
+    def test_views_stay_within_budget(self):
+        self.client.force_login(self.staff)
+        for url in [
+            reverse('admin_dashboard'),
+            reverse('admin_application_list'),
+            reverse('admin_application_list') + '?status=pending',
+            reverse('admin_interviews_list'),
+            reverse('admin_offers_list'),
+            reverse('admin_interns_list'),
+            reverse('admin_interns_list') + '?q=python',
+            reverse('admin_metrics'),
+        ]:
+            with self.subTest(url=url):
+                self.client.get(url)
+        pending = list(InternshipApplication.objects.filter(status='pending').values_list('id', flat=True)[:5])
+        self.client.post(reverse('admin_application_list'), {'application_ids': pending, 'action': 'approve'})
+
+        self.client.force_login(self.intern.user)
+        for url in [
+            reverse('dashboard'),
+            reverse('offer_list'),
+            reverse('offer_list') + '?q=intern&department=IT',
+            reverse('profile'),
+            reverse('edit_profile'),
+            reverse('upload_cv'),
+        ]:
+            with self.subTest(url=url):
+                self.client.get(url)
+
+    def test_over_budget_and_duplicate_queries_are_reported(self):
+        @query_budget(1)
+        def view(request):
+            for _ in range(2):
+                list(InternshipOffer.objects.filter(pk=1))
+            return None
+
+        with self.assertRaises(QueryBudgetExceeded) as raised:
+            view(RequestFactory().get('/'))
+        message = str(raised.exception)
+        self.assertIn('ran 2 queries; its budget is 1', message)
+        self.assertIn('Repeated 2 times', message)
+        self.assertIn('tests.py', message)
+
+    def test_async_view_queries_are_counted(self):
+        @query_budget(1)
+        async def view(request):
+            await InternshipOffer.objects.acount()
+            await InternshipOffer.objects.filter(is_archived=False).acount()
+            return None
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'ran 2 queries; its budget is 1'):
+            async_to_sync(view)(RequestFactory().get('/'))
+
+
+class InternDashboardCacheTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        seed(5, offers=6, applications_per_intern=2, random_seed=4)
+        self.intern = Intern.objects.filter(applications__status='pending').select_related('user').first()
+        self.client.force_login(self.intern.user)
+
+    def get_dashboard(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx)
+
+    def test_repeat_view_reuses_cached_summary(self):
+        _, first = self.get_dashboard()
+        _, repeat = self.get_dashboard()
+        # Session and user lookups, then the intern row only.
+        self.assertEqual(repeat, 3)
+        self.assertLess(repeat, first)
+
+    def test_status_change_refreshes_summary(self):
+        response, _ = self.get_dashboard()
+        approved_before = self.intern.applications.filter(status='approved').count()
+        self.assertContains(response, f'<h3 class="mb-1">{approved_before}</h3>')
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_applications(self.intern.applications.filter(status='pending'), 'approved')
+        response, _ = self.get_dashboard()
+        approved_after = self.intern.applications.filter(status='approved').count()
+        self.assertGreater(approved_after, approved_before)
+        self.assertContains(response, f'<h3 class="mb-1">{approved_after}</h3>')
+
+
+@override_settings(AUTHENTICATION_BACKENDS=['core.backends.ProfileCachingBackend'])
+class ProfileCachingBackendTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.user = User.objects.create_user('cached', 'cached@example.com', 'password')
+        self.client.force_login(self.user)
+
+    def test_user_and_profile_come_from_cache(self):
+        self.client.get(reverse('profile'))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('profile'))
+        self.assertEqual(response.status_code, 200)
+        # Only the session row is read.
+        self.assertEqual(len(ctx), 1)
+
+    def test_saving_the_user_drops_the_cached_copy(self):
+        self.client.get(reverse('profile'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        response = self.client.get(reverse('profile'))
+        self.assertEqual(response.status_code, 302)
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        seed(10, offers=6, random_seed=5)
+        self.staff = User.objects.get(username='bench-admin')
+        self.intern = Intern.objects.filter(applications__isnull=False).select_related('user').first()
+
+    def page(self, response):
+        self.assertEqual(response.status_code, 200)
+        return re.sub(r'name="csrfmiddlewaretoken" value="[^"]+"', '', response.content.decode())
+
+    def test_async_views_render_the_same_pages(self):
+        for user, name in [(self.staff, 'admin_dashboard'), (self.intern.user, 'dashboard'), (self.intern.user, 'offer_list')]:
+            with self.subTest(view=name):
+                self.client.force_login(user)
+                self.async_client.force_login(user)
+                expected = self.page(self.client.get(reverse(name)))
+                with serving_async_views(True):
+                    response = async_to_sync(self.async_client.get)(reverse(name))
+                    self.assertEqual(response.resolver_match.func.__name__, f'{name}_async')
+                self.assertEqual(self.page(response), expected)
+
+    def test_interfaces_are_compared_on_the_hot_urls(self):
+        report = compare_interfaces(requests=2, concurrency=1, warmup=0)
+        self.assertEqual(set(report['views']), set(HOT_URL_NAMES))
+        for name, interfaces in report['views'].items():
+            with self.subTest(view=name):
+                self.assertEqual(interfaces['wsgi']['status'], 200)
+                self.assertEqual(interfaces['asgi']['status'], 200)
+
+
+class FlakyEmailBackend(BaseEmailBackend):
+    """Accepts every message except those to ``reject``; ``down`` fails to connect."""
+
+    def __init__(self, reject=(), down=False, **kwargs):
+        super().__init__(**kwargs)
+        self.reject = set(reject)
+        self.down = down
+        self.delivered = []
+
+    def open(self):
+        if self.down:
+            raise ConnectionRefusedError('mail server unreachable')
+        return True
+
+    def send_messages(self, email_messages):
+        for message in email_messages:
+            if self.reject & set(message.to):
+                raise ValueError(f'rejected {message.to}')
+            self.delivered.extend(message.to)
+        return len(email_messages)
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            queue_emails([
+                OutgoingEmail(subject='Hello', body='Hi', from_email='noreply@example.com', to=[address])
+                for address in ['a@x', 'b@x', 'c@x', 'd@x']
+            ])
+
+    def test_claimed_batch_is_leased(self):
+        self.assertEqual(len(claim_batch(10)), 4)
+        self.assertEqual(claim_batch(10), [])
+
+    def test_rejected_message_does_not_resend_the_rest(self):
+        backend = FlakyEmailBackend(reject={'c@x'})
+        self.assertEqual(send_pending(connection=backend), (3, 1))
+        self.assertEqual(sorted(backend.delivered), ['a@x', 'b@x', 'd@x'])
+        failed = OutgoingEmail.objects.get(to=['c@x'])
+        self.assertEqual((failed.status, failed.attempts), ('pending', 1))
+        self.assertGreater(failed.next_attempt_at, timezone.now() + timedelta(seconds=RETRY_BASE_SECONDS - 5))
+
+    def test_unreachable_server_backs_off_the_batch(self):
+        self.assertEqual(send_pending(connection=FlakyEmailBackend(down=True)), (0, 4))
+        for email in OutgoingEmail.objects.all():
+            self.assertEqual(email.attempts, 1)
+            self.assertIn('unreachable', email.last_error)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertEqual(send_pending(connection=FlakyEmailBackend()), (0, 0))
+
+    def test_gives_up_after_max_attempts(self):
+        OutgoingEmail.objects.update(attempts=4)
+        send_pending(max_attempts=5, connection=FlakyEmailBackend(reject={'a@x'}))
+        self.assertEqual(OutgoingEmail.objects.get(to=['a@x']).status, 'failed')
+        self.assertEqual(OutgoingEmail.objects.filter(status='sent').count(), 3)
+
+
+class OfferImportTests(TestCase):
+    def test_equivalent_durations_are_parsed_once(self):
+        rows = [
+            {'title': f'Intern {n}', 'department': 'IT', 'duration': duration, 'requirements': 'SQL',
+             'start_date': str(date.today() + timedelta(days=30))}
+            for n, duration in enumerate(['3 months', '3 Months', ' 3   MONTHS', '6 months'])
+        ]
+        data = io.BytesIO(json.dumps(rows).encode())
+        with mock.patch('core.models.parse_duration_days', wraps=parse_duration_days) as parse:
+            result = import_offers(data, 'json')
+        self.assertEqual((result.created, result.errors), (4, []))
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual(sorted(InternshipOffer.objects.values_list('duration_days', flat=True)), [90, 90, 90, 180])
+
+    def test_unreadable_line_rolls_back_earlier_batches(self):
+        row = {'title': 'Data Intern', 'description': 'Dashboards', 'department': 'Data', 'duration': '3 months',
+               'requirements': 'SQL', 'start_date': str(date.today() + timedelta(days=30))}
+        data = (json.dumps(row) + '\n') * 2 + '{"title": broken\n'
+        with self.assertRaises(ValueError):
+            import_offers(io.BytesIO(data.encode()), 'jsonl', batch_size=1)
+        self.assertFalse(InternshipOffer.objects.exists())
+
+        import_offers(io.BytesIO(((json.dumps(row) + '\n') * 2).encode()), 'jsonl', batch_size=1)
+        self.assertEqual(InternshipOffer.objects.count(), 2)
+
+
+def use_temporary_media_root(test):
+    directory = tempfile.TemporaryDirectory()
+    test.addCleanup(directory.cleanup)
+    override = override_settings(MEDIA_ROOT=directory.name)
+    override.enable()
+    test.addCleanup(override.disable)
+
+
+class CVStorageTests(TestCase):
+    def setUp(self):
+        use_temporary_media_root(self)
+        self.storage = Intern._meta.get_field('cv').storage
+
+    def age(self, name, minutes):
+        then = time.time() - minutes * 60
+        os.utime(self.storage.path(name), (then, then))
+
+    def gc(self):
+        call_command('gc_cvs', '--min-age', '60', stdout=io.StringIO())
+
+    def test_deduplicated_upload_survives_gc(self):
+        name = self.storage.save('cvs/old.pdf', ContentFile(b'%PDF cv'))
+        self.age(name, 120)
+        # Same content saved again before the intern row points at it.
+        self.assertEqual(self.storage.save('cvs/new.pdf', ContentFile(b'%PDF cv')), name)
+        self.gc()
+        self.assertTrue(self.storage.exists(name))
+
+        self.age(name, 120)
+        self.gc()
+        self.assertFalse(self.storage.exists(name))
+
+    def test_referenced_blob_is_kept(self):
+        intern = User.objects.create_user('cv-owner', 'cv@example.com', 'password').intern
+        intern.cv.save('cv.pdf', ContentFile(b'%PDF owner'))
+        self.age(intern.cv.name, 120)
+        self.gc()
+        self.assertTrue(self.storage.exists(intern.cv.name))
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.offer = InternshipOffer.objects.create(
+            title='Archive', department='IT', duration='3 months', requirements='Python',
+            start_date=date.today() + timedelta(days=30),
+        )
+        self.created = 0
+
+    def add_cold_interviews(self, count):
+        for _ in range(count):
+            self.created += 1
+            user = User.objects.create_user(f'archived{self.created}', f'archived{self.created}@example.com', 'password')
+            application = InternshipApplication.objects.create(intern=user.intern, internship_offer=self.offer, status='approved')
+            Interview.objects.create(
+                application=application, date_time=timezone.now() - timedelta(days=400),
+                interview_type='zoom', zoom_link='https://zoom.example.com/j/1', status='completed', archived=True,
+            )
+
+    def move(self):
+        with CaptureQueriesContext(connection) as ctx:
+            run = move_interviews()
+        return run.rows, len(ctx)
+
+    def test_move_runs_a_fixed_number_of_queries_per_batch(self):
+        self.add_cold_interviews(1)
+        rows, baseline = self.move()
+        self.assertEqual(rows, 1)
+        self.add_cold_interviews(5)
+        self.assertEqual(self.move(), (5, baseline))
+        self.assertFalse(Interview.objects.exists())
+        self.assertEqual(ArchivedInterview.objects.count(), 6)
+
+    def test_moved_interviews_are_not_scheduled_again(self):
+        self.add_cold_interviews(1)
+        move_interviews()
+        user = User.objects.create_user('waiting', 'waiting@example.com', 'password')
+        waiting = InternshipApplication.objects.create(intern=user.intern, internship_offer=self.offer, status='approved')
+        self.assertEqual(list(unscheduled_applications()), [waiting])
+
+
+class SchedulingTests(TestCase):
+    def at(self, hour, minute=0, days=7):
+        return timezone.make_aware(datetime.combine(date.today() + timedelta(days=days), clock(hour, minute)))
+
+    def test_adjacent_intervals_do_not_overlap(self):
+        index = IntervalIndex()
+        index.add('room', self.at(9), self.at(10), 1)
+        index.add('room', self.at(10), self.at(11), 2)
+        index.add('room', self.at(6), self.at(12), 3)
+
+        def refs(start, end):
+            return sorted(ref for _, _, ref in index.overlapping('room', start, end))
+
+        self.assertEqual(refs(self.at(10), self.at(10, 30)), [2, 3])
+        self.assertEqual(refs(self.at(9, 30), self.at(10, 30)), [1, 2, 3])
+        self.assertEqual(refs(self.at(11, 30), self.at(11, 45)), [3])
+        self.assertEqual(refs(self.at(12), self.at(13)), [])
+        self.assertEqual([ref for _, _, ref in index.overlapping('room', self.at(9), self.at(11), exclude=3)], [1, 2])
+        self.assertEqual(index.first_free(['room'], self.at(7), timedelta(hours=1)), self.at(12))
+
+    def test_bulk_scheduling_never_double_books(self):
+        offers = [
+            InternshipOffer.objects.create(title=f'Offer {n}', department='IT', duration='3 months',
+                                           requirements='Python', start_date=date.today() + timedelta(days=30))
+            for n in range(2)
+        ]
+        first, second = (User.objects.create_user(f'candidate{n}', f'candidate{n}@example.com', 'password').intern for n in range(2))
+        applications = [
+            InternshipApplication.objects.create(intern=intern, internship_offer=offer, status='approved')
+            for intern, offer in [(first, offers[0]), (first, offers[1]), (second, offers[0])]
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            result = schedule_interviews(
+                [application.id for application in applications], [Slot(self.at(9), self.at(10))], 30, 'in_person', ['Room A', 'Room B'],
+            )
+        self.assertEqual((len(result), result.unscheduled_ids), (3, []))
+        self.assertEqual(OutgoingEmail.objects.count(), 3)
+
+        interviews = list(Interview.objects.select_related('application'))
+        for n, one in enumerate(interviews):
+            self.assertTrue(self.at(9) <= one.date_time < self.at(10))
+            for other in interviews[n + 1:]:
+                if one.location == other.location or one.application.intern_id == other.application.intern_id:
+                    self.assertNotEqual(one.date_time, other.date_time)
+
+        result = schedule_interviews([application.id for application in applications], [Slot(self.at(9), self.at(10))], 30, 'in_person', ['Room A'])
+        self.assertEqual((len(result), result.skipped), (0, 3))
+
+    def test_admin_form_detects_room_clash_without_application(self):
+        start = timezone.localtime(timezone.now() + timedelta(days=3)).replace(hour=10, minute=0, second=0, microsecond=0)
+        Interview.objects.create(date_time=start, interview_type='in_person', location='Room 1')
+        form = InterviewAdminForm(data={
+            'date_time': (start + timedelta(minutes=30)).strftime('%Y-%m-%d %H:%M'),
+            'duration_minutes': 60,
+            'interview_type': 'in_person',
+            'location': ' room  1 ',
+            'status': 'scheduled',
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('This location is already booked', str(form.errors['date_time']))
+
+    @override_settings(INTERVIEW_WORKING_HOURS=(9, 11))
+    def test_interview_longer_than_the_working_day_is_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'does not fit in the working day (09:00-11:00)'):
+            InterviewCalendar().next_free_slot([('location', 'room 1')], timezone.now(), timedelta(hours=3))
+
+
+@override_settings(SENDFILE_BACKEND=None)
+class CVDownloadTests(TestCase):
+    def setUp(self):
+        use_temporary_media_root(self)
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'password').intern
+        self.owner.cv.save('cv.pdf', ContentFile(b'%PDF owner cv'))
+        self.url = reverse('serve_cv', args=[self.owner.id])
+
+    def download(self, user, **headers):
+        self.client.force_login(user)
+        return self.client.get(self.url, headers=headers)
+
+    def test_only_the_owner_and_staff_can_download(self):
+        response = self.download(self.owner.user)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF owner cv')
+        self.assertIn('private', response['Cache-Control'])
+
+        staff = User.objects.create_user('staff', 'staff@example.com', 'password', is_staff=True)
+        self.assertEqual(self.download(staff).status_code, 200)
+
+        other = User.objects.create_user('other', 'other@example.com', 'password')
+        self.assertEqual(self.download(other).status_code, 404)
+
+    def test_conditional_request_is_not_modified(self):
+        etag = self.download(self.owner.user)['ETag']
+        response = self.download(self.owner.user, if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_transfer_is_offloaded_to_the_front_end_server(self):
+        with self.settings(SENDFILE_BACKEND='x-accel-redirect', SENDFILE_URL_PREFIX='/protected/'):
+            response = self.download(self.owner.user)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/' + self.owner.cv.name)
+        self.assertEqual(response.content, b'')
+
+        with self.settings(SENDFILE_BACKEND='x-sendfile'):
+            response = self.download(self.owner.user)
+        self.assertEqual(response['X-Sendfile'], self.owner.cv.path)
+
+
+class TransitionTests(TestCase):
+    def setUp(self):
+        offer = InternshipOffer.objects.create(title='Offer', department='IT', duration='3 months',
+                                               requirements='Python', start_date=date.today() + timedelta(days=30))
+        for n, (status, interview_status) in enumerate([('pending', None), ('approved', None), ('approved', 'completed')]):
+            intern = User.objects.create_user(f'moved{n}', f'moved{n}@example.com', 'password').intern
+            application = InternshipApplication.objects.create(intern=intern, internship_offer=offer, status=status)
+            if interview_status:
+                Interview.objects.create(application=application, date_time=timezone.now(), interview_type='zoom',
+                                         zoom_link='https://zoom.example.com/j/1', status=interview_status)
+
+    def test_disallowed_rows_are_skipped(self):
+        result = transition_applications(InternshipApplication.objects.all(), 'approved')
+        self.assertEqual((len(result), result.skipped), (1, 2))
+        self.assertEqual(InternshipApplication.objects.filter(status='approved').count(), 3)
+
+    def test_rejected_transition_updates_nothing(self):
+        interview = Interview.objects.get()
+        with CaptureQueriesContext(connection) as ctx:
+            result = transition_interviews(Interview.objects.all(), 'in_progress')
+        self.assertEqual((len(result), result.skipped), (0, 1))
+        self.assertFalse([query for query in ctx.captured_queries if query['sql'].startswith('UPDATE')])
+        interview.refresh_from_db()
+        self.assertEqual(interview.status, 'completed')
+
+        with self.assertRaises(InvalidTransition):
+            transition_applications(InternshipApplication.objects.all(), 'pending')
+        self.assertEqual(InternshipApplication.objects.filter(status='pending').count(), 1)
+
+
+class CursorPaginatorTests(TestCase):
+    def test_next_and_previous_round_trip_over_ties(self):
+        # Three offers share each start date, so pages split runs of equal keys.
+        for n in range(7):
+            InternshipOffer.objects.create(title=f'Offer {n}', department='IT', duration='3 months',
+                                           requirements='Python', start_date=date.today() + timedelta(days=30 + n // 3))
+        expected = list(InternshipOffer.objects.order_by('-start_date', '-id').values_list('id', flat=True))
+        paginator = CursorPaginator(InternshipOffer.objects.all(), 2, ('-start_date', '-id'))
+
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+        self.assertEqual([offer.id for page in pages for offer in page], expected)
+        self.assertFalse(pages[0].has_previous())
+
+        page = pages[-1]
+        for previous in reversed(pages[:-1]):
+            page = paginator.get_page(page.previous_cursor)
+            self.assertEqual([offer.id for offer in page], [offer.id for offer in previous])
+        self.assertFalse(page.has_previous())
+        self.assertEqual(paginator.get_page('not a cursor').object_list, pages[0].object_list)
+
+
+class OfferSearchTests(TestCase):
+    def setUp(self):
+        if isinstance(get_backend(), IContainsBackend):
+            self.skipTest('No full-text engine on this database.')
+
+    def offer(self, title, description, department='IT'):
+        return InternshipOffer.objects.create(title=title, description=description, department=department, duration='3 months',
+                                              requirements='Teamwork', start_date=date.today() + timedelta(days=30))
+
+    def test_title_matches_rank_first_and_filters_apply(self):
+        in_description = self.offer('Backend intern', 'Services written in Python')
+        in_title = self.offer('Python intern', 'Internal tooling')
+        in_other_department = self.offer('Python analyst', 'Reports', department='Data')
+        self.assertEqual(list(search_offers(InternshipOffer.objects.filter(department='IT'), 'pyth')), [in_title.id, in_description.id])
+        self.assertIn(in_other_department.id, list(search_offers(InternshipOffer.objects.all(), 'python')))
+
+    def test_pages_are_limited_in_the_query(self):
+        for n in range(5):
+            self.offer(f'Python intern {n}', 'Internal tooling')
+        results = search_offers(InternshipOffer.objects.all(), 'python')
+        expected = list(results)
+        paginator = SequenceCursorPaginator(results, 2)
+        with CaptureQueriesContext(connection) as ctx:
+            page = paginator.get_page(paginator.get_page().next_cursor)
+        self.assertEqual((page.object_list, page.total), (expected[2:4], 5))
+        self.assertEqual(len(ctx), 2)
+        self.assertIn('LIMIT', ctx.captured_queries[-1]['sql'])
+
+        past_the_end = paginator.get_page(encode_cursor({'o': 10}))
+        self.assertEqual((past_the_end.object_list, past_the_end.total), ([], 5))
+
+    def test_index_follows_updates_and_deletes(self):
+        offer = self.offer('Python intern', 'Internal tooling')
+        offer.title = 'Rust intern'
+        offer.save()
+        self.assertEqual(list(search_offers(InternshipOffer.objects.all(), 'python')), [])
+        self.assertEqual(list(search_offers(InternshipOffer.objects.all(), 'rust')), [offer.id])
+        offer.delete()
+        self.assertEqual(list(search_offers(InternshipOffer.objects.all(), 'rust')), [])
+
+
+class ExportCommandTests(TestCase):
+    def test_csv_export_is_written_to_the_command_stdout(self):
+        seed(3, offers=2, random_seed=6)
+        out = io.StringIO()
+        call_command('export_applications', stdout=out)
+        lines = out.getvalue().lstrip('\ufeff').splitlines()
+        self.assertEqual(len(lines), InternshipApplication.objects.count() + 1)
@@ -0,0 +1,121 @@
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Case, F, Q, TextField, Value, When
+from django.utils import timezone
+
+from .counters import invalidate_dashboard_metrics, invalidate_intern_summaries
+from .models import InternshipApplication
+from .outbox import build_email, queue_emails
+
+# Target status -> statuses it may be reached from.
+APPLICATION_TRANSITIONS = {
+    'approved': {'pending', 'refused'},
+    'refused': {'pending', 'approved'},
+}
+
+INTERVIEW_TRANSITIONS = {
+    'in_progress': {'scheduled'},
+    'completed': {'scheduled', 'in_progress', 'cancelled', 'no_show'},
+    'cancelled': {'scheduled', 'in_progress', 'completed', 'no_show'},
+    'no_show': {'scheduled', 'in_progress', 'completed', 'cancelled'},
+}
+
+APPLICATION_EMAILS = {
+    'approved': ('Application Approved', 'emails/application_approved.html'),
+    'refused': ('Application Not Selected', 'emails/application_rejected.html'),
+}
+
+# Keeps each UPDATE's IN (...) list well under database parameter limits.
+UPDATE_CHUNK_SIZE = 5000
+
+
+class InvalidTransition(ValueError):
+    pass
+
+
+def _chunks(ids):
+    for start in range(0, len(ids), UPDATE_CHUNK_SIZE):
+        yield ids[start:start + UPDATE_CHUNK_SIZE]
+
+
+@dataclass
+class TransitionResult:
+    status: str
+    updated_ids: list = field(default_factory=list)
+    skipped: int = 0
+
+    def __len__(self):
+        return len(self.updated_ids)
+
+
+def _bulk_transition(queryset, status, transitions, intern_field, **updates):
+    if status not in transitions:
+        raise InvalidTransition(f"Cannot move {queryset.model._meta.verbose_name_plural} to '{status}'.")
+
+    with transaction.atomic():
+        total = queryset.count()
+        ids = list(
+            queryset.order_by()
+            .select_for_update()
+            .filter(status__in=transitions[status])
+            .values_list('id', flat=True)
+        )
+        for chunk in _chunks(ids):
+            rows = queryset.model.objects.filter(id__in=chunk)
+            rows.update(status=status, **updates)
+            invalidate_intern_summaries(rows.values_list(intern_field, flat=True))
+        if ids:
+            invalidate_dashboard_metrics()
+
+    return TransitionResult(status=status, updated_ids=ids, skipped=total - len(ids))
+
+
+def transition_applications(queryset, status):
+    """Move every application in ``queryset`` allowed to reach ``status`` there in bulk.
+
+    Signals are not sent; use the returned ids for notifications.
+    """
+    return _bulk_transition(queryset, status, APPLICATION_TRANSITIONS, 'intern_id')
+
+
+def transition_interviews(queryset, status):
+    updates = {'updated_at': timezone.now()}
+    if status == 'completed':
+        # Mirrors Interview.clean() for rows that never went through a form.
+        updates['feedback'] = Case(
+            When(Q(feedback__isnull=True) | Q(feedback=''), then=Value('Completed as scheduled.')),
+            default=F('feedback'),
+            output_field=TextField(),
+        )
+    return _bulk_transition(queryset, status, INTERVIEW_TRANSITIONS, 'application__intern_id', **updates)
+
+
+def toggle_interviews_archived(queryset):
+    updated = queryset.update(
+        archived=Case(When(archived=True, then=Value(False)), default=Value(True)),
+        updated_at=timezone.now(),
+    )
+    invalidate_dashboard_metrics()
+    return updated
+
+
+def queue_application_decision_emails(result):
+    """Queue the approval/refusal email for every application in ``result``."""
+    subject, template_name = APPLICATION_EMAILS[result.status]
+    emails = []
+    for chunk in _chunks(result.updated_ids):
+        applications = (
+            InternshipApplication.objects
+            .filter(id__in=chunk)
+            .exclude(intern__user__email='')
+            .select_related('intern__user', 'internship_offer')
+        )
+        for application in applications:
+            user = application.intern.user
+            context = {
+                'user': user,
+                'offer': application.internship_offer,
+            }
+            emails.append(build_email(f"{subject} - {application.internship_offer.title}", template_name, context, [user.email]))
+    return queue_emails(emails)
@@ -5,21 +5,33 @@ from .models import InternshipOffer , Intern , InternshipApplication, Interview
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import get_object_or_404
-from .forms import CVUploadForm, CustomUserCreationForm, UserEditForm
+from django.http import Http404, JsonResponse
+import asyncio
+import os
+from .forms import CVUploadForm, CustomUserCreationForm, InterviewScheduleForm, UserEditForm
+from .counters import aget_dashboard_metrics, aget_intern_summary, get_dashboard_metrics, get_intern_summary
+from .dashboard import alist
+from .instrumentation import LATENCY_BUCKETS_MS, summary as metrics_summary
+from .search import search_interns, search_offers
+from .storage import CVUploadHandler
+from .sendfile import sendfile_response
+from .pagination import CursorPaginator, SequenceCursorPaginator
+from .query_budget import query_budget
+from .scheduling import schedule_interviews, unscheduled_applications
+from .transitions import queue_application_decision_emails, transition_applications
+from .exports import (
+    APPLICATION_COLUMNS, INTERN_COLUMNS, INTERVIEW_COLUMNS,
+    export_response, filter_applications, filter_interns, filter_interviews, filter_offers,
+)
+from asgiref.sync import sync_to_async
 from django.utils import timezone
 from django.contrib.auth import login
-from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import Count, F, Q
 from django.contrib.auth.views import LoginView
 from django.urls import reverse_lazy
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 
-# Safe import for intern_required decorator
-try:
-    from .decorators import intern_required
-except ImportError:
-    # Fallback decorator that does nothing
-    def intern_required(view_func):
-        return view_func
+from .decorators import aget_request_intern, aload_user, get_request_intern, intern_required
 
 # Custom Login View with reverse_lazy
 class CustomLoginView(LoginView):
@@ -38,6 +50,7 @@ class CustomLoginView(LoginView):
         # For regular users, redirect to dashboard
         return reverse_lazy('dashboard')
 
+@query_budget(9)
 def register(request):
     if request.method == 'POST':
         form = CustomUserCreationForm(request.POST)
@@ -51,21 +64,13 @@ def register(request):
         form = CustomUserCreationForm()
     return render(request, 'registration/register.html', {'form': form})
 
+@query_budget(8)
 def home(request):
     if request.user.is_authenticated:
         return redirect('dashboard')
     return offer_list(request)
 
-@intern_required
-def dashboard(request):
-    intern = get_object_or_404(Intern, user=request.user)
-    applications = InternshipApplication.objects.filter(intern=intern).select_related('internship_offer').order_by('-applied_at')
-
-    all_applications = InternshipApplication.objects.filter(intern=intern)
-    pending_count = all_applications.filter(status='pending').count()
-    approved_count = all_applications.filter(status='approved').count()
-    refused_count = all_applications.filter(status='refused').count()
-
+def _dashboard_context(intern, summary):
     current_hour = timezone.now().hour
     if 5 <= current_hour < 12:
         time_greeting = 'morning'
@@ -80,48 +85,100 @@ def dashboard(request):
         time_greeting = 'night'
         time_icon = '🌙'
 
-    return render(request, 'intern/dashboard.html', {
+    return {
         'intern': intern,
-        'applications': applications,
-        'pending_count': pending_count,
-        'approved_count': approved_count,
-        'refused_count': refused_count,
+        'summary': summary,
         'time_greeting': time_greeting,
         'time_icon': time_icon,
-    })
+    }
 
 
-def offer_list(request):
+@query_budget(6)
+@intern_required
+def dashboard(request):
+    intern = get_request_intern(request)
+    summary = get_intern_summary(intern.id)
+    return render(request, 'intern/dashboard.html', _dashboard_context(intern, summary))
+
+
+@query_budget(6)
+@intern_required
+async def dashboard_async(request):
+    intern = await aget_request_intern(request)
+    summary = await aget_intern_summary(intern.id)
+    return render(request, 'intern/dashboard.html', _dashboard_context(intern, summary))
+
+
+# (per page, ordering) of the cursor-paginated lists; explain_hot_queries
+# builds its plans from these and the queryset helpers below.
+OFFER_LIST_PAGING = (6, ('-start_date', '-id'))
+ADMIN_APPLICATION_PAGING = (10, ('-applied_at', '-id'))
+ADMIN_INTERVIEW_PAGING = (25, ('-date_time', '-id'))
+ADMIN_OFFER_PAGING = (25, ('-start_date', '-id'))
+# Interns are created with their user, so id order is join order and,
+# unlike auth_user.date_joined, it is indexed.
+ADMIN_INTERN_PAGING = (25, ('-id',))
+
+
+def admin_applications():
+    return InternshipApplication.objects.select_related('intern__user', 'internship_offer')
+
+
+def admin_interviews():
+    return Interview.objects.select_related('application__intern__user', 'application__internship_offer')
+
+
+def admin_interns():
+    return Intern.objects.select_related('user').annotate(applications_total=Count('applications'))
+
+
+def offer_filters(params):
     offers = InternshipOffer.objects.all()
-    department = request.GET.get('department', '')
-    duration = request.GET.get('duration', '')
-    q = request.GET.get('q', '')
+    department = params.get('department', '')
+    duration = params.get('duration', '')
+    q = params.get('q', '').strip()
 
     if department:
         offers = offers.filter(department=department)
     if duration:
         offers = offers.filter(duration=duration)
-    if q:
-        offers = offers.filter(
-            Q(title__icontains=q) | Q(description__icontains=q) | Q(requirements__icontains=q)
-        )
+    return offers, department, duration, q
 
-    departments = InternshipOffer.objects.values_list('department', flat=True).distinct()
-    all_offers = InternshipOffer.objects.all()
-    durations = sorted(
-        set(offer.duration for offer in all_offers if offer.duration),
-        key=lambda x: int(x.split()[0]) if x.split() and x.split()[0].isdigit() else 0
+
+def offer_facets():
+    department_facets = (
+        InternshipOffer.objects.values('department')
+        .annotate(count=Count('id'))
+        .order_by('department')
+    )
+    duration_facets = (
+        InternshipOffer.objects.exclude(duration='')
+        .values('duration_days', 'duration')
+        .annotate(count=Count('id'))
+        .order_by(F('duration_days').asc(nulls_first=True), 'duration')
     )
-    paginator = Paginator(offers.order_by('-start_date'), 6)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    return department_facets, duration_facets
+
+
+def _offer_page(offers, q, cursor):
+    if q:
+        # Paginate the relevance-ranked ids, then load only the current page.
+        page_obj = SequenceCursorPaginator(search_offers(offers, q), OFFER_LIST_PAGING[0]).get_page(cursor)
+        offers_by_id = InternshipOffer.objects.in_bulk(page_obj.object_list)
+        page_offers = [offers_by_id[pk] for pk in page_obj.object_list if pk in offers_by_id]
+    else:
+        page_obj = CursorPaginator(offers, *OFFER_LIST_PAGING, count=True).get_page(cursor)
+        page_offers = page_obj.object_list
+    return page_obj, page_offers
+
 
+def _offer_list_response(request, department, duration, q, department_facets, duration_facets, page):
+    page_obj, page_offers = page
     context = {
-        'offers': page_obj.object_list,
-        'departments': departments,
-        'durations': durations,
+        'offers': page_offers,
+        'department_facets': department_facets,
+        'duration_facets': duration_facets,
         'page_obj': page_obj,
-        'is_paginated': page_obj.has_other_pages(),
         'request': request,
         'selected_department': department,
         'selected_duration': duration,
@@ -130,10 +187,34 @@ def offer_list(request):
     return render(request, "offers/offer_list.html", context)
 
 
+@query_budget(7)
+def offer_list(request):
+    offers, department, duration, q = offer_filters(request.GET)
+    department_facets, duration_facets = offer_facets()
+    page = _offer_page(offers, q, request.GET.get('cursor'))
+    return _offer_list_response(request, department, duration, q, department_facets, duration_facets, page)
+
+
+@query_budget(7)
+async def offer_list_async(request):
+    await aload_user(request)
+    offers, department, duration, q = offer_filters(request.GET)
+    department_facets, duration_facets = offer_facets()
+    # The paginators and full-text search are synchronous; the page is
+    # loaded in one thread hop while the facets are read asynchronously.
+    department_facets, duration_facets, page = await asyncio.gather(
+        alist(department_facets),
+        alist(duration_facets),
+        sync_to_async(_offer_page)(offers, q, request.GET.get('cursor')),
+    )
+    return _offer_list_response(request, department, duration, q, department_facets, duration_facets, page)
+
+
+@query_budget(8)
 @intern_required
 def apply_offer(request, offer_id):
     offer = get_object_or_404(InternshipOffer, id=offer_id)
-    intern, _ = Intern.objects.get_or_create(user=request.user)
+    intern = get_request_intern(request)
 
     if not intern.cv:
         messages.warning(request, "Please upload your CV before applying to offers.")
@@ -152,9 +233,20 @@ def apply_offer(request, offer_id):
     return redirect('offer_list')
 
 
+@query_budget(10)
+@csrf_exempt
 @intern_required
 def upload_cv(request):
-    intern, _ = Intern.objects.get_or_create(user=request.user)
+    # Upload handlers must be swapped before anything reads request.POST,
+    # including the CSRF middleware; the check runs in _upload_cv instead.
+    handler = CVUploadHandler(request)
+    request.upload_handlers = [handler]
+    return _upload_cv(request, handler)
+
+
+@csrf_protect
+def _upload_cv(request, handler):
+    intern = get_request_intern(request)
     
     if request.method == 'POST':
         form = CVUploadForm(
@@ -162,12 +254,14 @@ def upload_cv(request):
             request.FILES, 
             instance=intern
         )
+        is_valid = form.is_valid()
+        if handler.error:
+            # The rejected file never reached request.FILES.
+            form.add_error('cv', handler.error)
+            is_valid = False
         
-        if form.is_valid():
+        if is_valid:
             form.save()
-            
-            intern.updated_at = timezone.now()
-            intern.save()
             messages.success(request, "Your CV has been uploaded successfully!")
             next_url = request.GET.get('next', 'home')
             return redirect(next_url)
@@ -179,6 +273,23 @@ def upload_cv(request):
         'intern': intern  
     })
 
+@query_budget(4)
+@login_required
+def serve_cv(request, intern_id):
+    intern = get_object_or_404(Intern.objects.select_related('user'), id=intern_id)
+    if not (request.user.is_staff or intern.user_id == request.user.id):
+        raise Http404
+    if not intern.cv:
+        raise Http404
+
+    extension = os.path.splitext(intern.cv.name)[1]
+    filename = f"{intern.user.get_full_name() or intern.user.username} CV{extension}"
+    try:
+        return sendfile_response(request, intern.cv.storage, intern.cv.name, filename)
+    except FileNotFoundError:
+        raise Http404
+
+@query_budget(8)
 @intern_required
 def edit_profile(request):
     if request.method == 'POST':
@@ -192,106 +303,81 @@ def edit_profile(request):
     
     return render(request, 'intern/edit_profile.html', {'form': form})
 
+@query_budget(3)
 @intern_required
 def profile(request):
-    intern = get_object_or_404(Intern, user=request.user)
+    intern = get_request_intern(request)
     return render(request, 'intern/profile.html', {'intern': intern})
 
-@staff_member_required
-def admin_dashboard(request):
-    from django.utils import timezone
-    from datetime import timedelta
-    from django.db.models import Count
-    import json
-    
-    total_applications = InternshipApplication.objects.count()
-    pending_applications = InternshipApplication.objects.filter(status='pending').count()
-    
-    total_interns = Intern.objects.count()
-    active_interns = Intern.objects.filter(applications__status='approved').distinct().count()
-    
-    now = timezone.now()
-    week_from_now = now + timedelta(days=7)
-    upcoming_interviews = Interview.objects.filter(date_time__gt=now, date_time__lte=week_from_now).count()
-    interviews_this_week = Interview.objects.filter(date_time__gte=now, date_time__lte=week_from_now).count()
-    
-    active_offers = InternshipOffer.objects.filter(is_archived=False).count()
-    total_offers = InternshipOffer.objects.count()
-    
+def admin_dashboard_tables(now):
     recent_applications = InternshipApplication.objects.select_related('intern__user', 'internship_offer').order_by('-applied_at')[:5]
     upcoming_interviews_list = Interview.objects.select_related('application__intern__user', 'application__internship_offer').filter(date_time__gt=now).order_by('date_time')[:5]
-    
-    department_data = InternshipApplication.objects.values('internship_offer__department').annotate(count=Count('id')).order_by('-count')
-    department_labels = json.dumps([item['internship_offer__department'] or 'Unknown' for item in department_data])
-    department_counts = json.dumps([item['count'] for item in department_data])
-    
-    offers_by_department = InternshipOffer.objects.values('department').annotate(count=Count('id')).order_by('-count')
-    offers_department_labels = json.dumps([item['department'] or 'Unknown' for item in offers_by_department])
-    offers_department_data = json.dumps([item['count'] for item in offers_by_department])
-    
-    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    interviews_by_day = {}
-    for i in range(30):
-        day = start_of_month + timedelta(days=i)
-        if day > now:
-            break
-        day_interviews = Interview.objects.filter(date_time__date=day.date()).count()
-        interviews_by_day[day.strftime('%m/%d')] = day_interviews
-    
-    interview_month_labels = json.dumps(list(interviews_by_day.keys()))
-    interview_month_data = json.dumps(list(interviews_by_day.values()))
-    
-    context = {
-        'total_applications': total_applications,
-        'pending_applications': pending_applications,
-        'active_interns': active_interns,
-        'total_interns': total_interns,
-        'upcoming_interviews': upcoming_interviews,
-        'interviews_this_week': interviews_this_week,
-        'active_offers': active_offers,
-        'total_offers': total_offers,
+    return recent_applications, upcoming_interviews_list
+
+def _admin_dashboard_response(request, metrics, recent_applications, upcoming_interviews_list):
+    context = metrics.as_context()
+    context.update({
         'recent_applications': recent_applications,
         'upcoming_interviews_list': upcoming_interviews_list,
-        'department_labels': department_labels,
-        'department_data': department_counts,
-        'offers_department_labels': offers_department_labels,
-        'offers_department_data': offers_department_data,
-        'interview_month_labels': interview_month_labels,
-        'interview_month_data': interview_month_data,
-    }
+    })
     return render(request, 'admin/index.html', context)
 
+@query_budget(11)
+@staff_member_required
+def admin_dashboard(request):
+    metrics = get_dashboard_metrics()
+    recent_applications, upcoming_interviews_list = admin_dashboard_tables(timezone.now())
+    return _admin_dashboard_response(request, metrics, recent_applications, upcoming_interviews_list)
+
+@query_budget(11)
+@staff_member_required
+async def admin_dashboard_async(request):
+    await aload_user(request)
+    recent_applications, upcoming_interviews_list = admin_dashboard_tables(timezone.now())
+    # On a cache miss the KPI queries are awaited together as well.
+    metrics, recent_applications, upcoming_interviews_list = await asyncio.gather(
+        aget_dashboard_metrics(),
+        alist(recent_applications),
+        alist(upcoming_interviews_list),
+    )
+    return _admin_dashboard_response(request, metrics, recent_applications, upcoming_interviews_list)
+
+@query_budget(2)
+@staff_member_required
+def admin_metrics(request):
+    rows = metrics_summary()
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'buckets_ms': LATENCY_BUCKETS_MS, 'views': rows})
+    labels = [f'≤{bound}' for bound in LATENCY_BUCKETS_MS] + [f'>{LATENCY_BUCKETS_MS[-1]}']
+    for row in rows:
+        row['buckets'] = [(label, count) for label, count in zip(labels, row['histogram']) if count]
+    return render(request, 'admin/metrics.html', {'rows': rows})
+
+@query_budget(12)
 @staff_member_required
 def admin_application_list(request):
-    status_filter = (request.GET.get('status') or '').lower()
     department_filter = request.GET.get('department') or ''
-
     status_choices = dict(InternshipApplication.STATUS_CHOICES)
-    queryset = InternshipApplication.objects.select_related('intern__user', 'internship_offer').order_by('-applied_at')
-
-    if status_filter not in status_choices:
-        status_filter = ''
-    if status_filter:
-        queryset = queryset.filter(status=status_filter)
-    if department_filter:
-        queryset = queryset.filter(internship_offer__department=department_filter)
+    queryset, status_filter = filter_applications(admin_applications(), request.GET.get('status'), department_filter)
 
     if request.method == 'POST':
-        application_id = request.POST.get('application_id')
+        application_ids = [pk for pk in request.POST.getlist('application_ids') if pk.isdigit()]
+        if request.POST.get('application_id', '').isdigit():
+            application_ids.append(request.POST['application_id'])
         action = request.POST.get('action')
-        if application_id and action in {'approve', 'reject'}:
-            application = get_object_or_404(InternshipApplication, pk=application_id)
+        if application_ids and action in {'approve', 'reject'}:
             new_status = 'approved' if action == 'approve' else 'refused'
-            if application.status == new_status:
-                messages.info(request, "No status change was required for this application.")
+            result = transition_applications(InternshipApplication.objects.filter(pk__in=application_ids), new_status)
+            queue_application_decision_emails(result)
+            if not result.updated_ids:
+                messages.info(request, "No status change was required for the selected application(s).")
             else:
-                application.status = new_status
-                application.save()
                 messages.success(
                     request,
-                    f"Application for {application.intern.user.get_full_name() or application.intern.user.username} "
-                    f"marked as {application.get_status_display()}."
+                    f"{len(result)} application(s) marked as {status_choices[new_status]}."
                 )
+        elif action in {'approve', 'reject'}:
+            messages.warning(request, "Select at least one application.")
         return redirect(request.get_full_path())
 
     departments = (
@@ -301,12 +387,11 @@ def admin_application_list(request):
         .distinct()
     )
 
-    page_obj = Paginator(queryset, 10).get_page(request.GET.get('page'))
+    page_obj = CursorPaginator(queryset, *ADMIN_APPLICATION_PAGING, count=True).get_page(request.GET.get('cursor'))
 
     context = {
         'applications': page_obj.object_list,
         'page_obj': page_obj,
-        'is_paginated': page_obj.has_other_pages(),
         'status_choices': status_choices,
         'departments': departments,
         'current_status': status_filter,
@@ -314,30 +399,105 @@ def admin_application_list(request):
     }
     return render(request, 'admin/applications_list.html', context)
 
+@query_budget(12)
+@staff_member_required
+def admin_schedule_interviews(request):
+    application_ids = sorted({int(pk) for pk in request.GET.getlist('application_ids') + request.POST.getlist('application_ids') if pk.isdigit()})
+    applications = (
+        unscheduled_applications().filter(id__in=application_ids)
+        .select_related('intern__user', 'internship_offer')
+        .order_by('applied_at', 'id')
+    )
+    if not applications:
+        messages.warning(request, "Select approved applications that have no interview yet.")
+        return redirect('admin_application_list')
+
+    # The applications list posts just the selection (a GET would put its
+    # CSRF token in the URL); the form is bound once it is submitted itself.
+    form = InterviewScheduleForm(request.POST if 'windows' in request.POST else None)
+    if form.is_bound and form.is_valid():
+        result = schedule_interviews(
+            [application.id for application in applications],
+            form.cleaned_data['windows'],
+            form.cleaned_data['duration_minutes'],
+            form.cleaned_data['interview_type'],
+            form.cleaned_data['rooms'],
+        )
+        if result.interviews:
+            messages.success(request, f"{len(result)} interview(s) scheduled and candidates notified.")
+        if result.unscheduled_ids:
+            messages.warning(request, f"{len(result.unscheduled_ids)} application(s) did not fit in the given windows.")
+        return redirect('admin_interviews_list')
+
+    return render(request, 'admin/schedule_interviews.html', {
+        'form': form,
+        'applications': applications,
+        'skipped': len(application_ids) - len(applications),
+    })
+
+@query_budget(4)
 @staff_member_required
 def admin_interviews_list(request):
     status = request.GET.get('status', '')
-    interviews = Interview.objects.select_related('application__intern__user', 'application__internship_offer').order_by('-date_time')
-    if status:
-        interviews = interviews.filter(status=status)
-    return render(request, 'admin/interviews_list.html', {'interviews': interviews, 'current_status': status})
+    interviews = filter_interviews(admin_interviews(), status)
+    page_obj = CursorPaginator(interviews, *ADMIN_INTERVIEW_PAGING, count=True).get_page(request.GET.get('cursor'))
+    return render(request, 'admin/interviews_list.html', {
+        'interviews': page_obj.object_list,
+        'page_obj': page_obj,
+        'current_status': status,
+    })
 
+@query_budget(4)
 @staff_member_required
 def admin_offers_list(request):
     archived = request.GET.get('archived')
-    offers = InternshipOffer.objects.all().order_by('-start_date')
-    if archived:
-        offers = offers.filter(is_archived=True)
-    else:
-        offers = offers.filter(is_archived=False)
-    return render(request, 'admin/offers_list.html', {'offers': offers, 'current_archived': archived})
+    offers = filter_offers(InternshipOffer.objects.all(), archived)
+    page_obj = CursorPaginator(offers, *ADMIN_OFFER_PAGING, count=True).get_page(request.GET.get('cursor'))
+    return render(request, 'admin/offers_list.html', {
+        'offers': page_obj.object_list,
+        'page_obj': page_obj,
+        'current_archived': archived,
+    })
 
+@query_budget(5)
 @staff_member_required
 def admin_interns_list(request):
     cv_status = request.GET.get('cv_status')
-    interns = Intern.objects.select_related('user').order_by('-user__date_joined')
-    if cv_status == 'has_cv':
-        interns = interns.filter(cv__isnull=False)
-    elif cv_status == 'no_cv':
-        interns = interns.filter(cv__isnull=True)
-    return render(request, 'admin/interns_list.html', {'interns': interns, 'current_cv': cv_status})
\ No newline at end of file
+    interns = filter_interns(admin_interns(), cv_status)
+    q = request.GET.get('q', '').strip()
+    if q:
+        # Rank on the CV text index, then load only the current page.
+        page_obj = SequenceCursorPaginator(search_interns(interns, q), ADMIN_INTERN_PAGING[0]).get_page(request.GET.get('cursor'))
+        interns_by_id = interns.in_bulk(page_obj.object_list)
+        page_interns = [interns_by_id[pk] for pk in page_obj.object_list if pk in interns_by_id]
+    else:
+        page_obj = CursorPaginator(interns, *ADMIN_INTERN_PAGING, count=True).get_page(request.GET.get('cursor'))
+        page_interns = page_obj.object_list
+    return render(request, 'admin/interns_list.html', {
+        'interns': page_interns,
+        'page_obj': page_obj,
+        'current_cv': cv_status,
+        'search_query': q,
+    })
+
+@query_budget(3)
+@staff_member_required
+def admin_application_export(request):
+    queryset, _ = filter_applications(
+        InternshipApplication.objects.all(),
+        request.GET.get('status'),
+        request.GET.get('department') or '',
+    )
+    return export_response(queryset.order_by('-applied_at', '-id'), APPLICATION_COLUMNS, 'applications', request.GET.get('format', 'csv'))
+
+@query_budget(3)
+@staff_member_required
+def admin_interviews_export(request):
+    queryset = filter_interviews(Interview.objects.all(), request.GET.get('status', ''))
+    return export_response(queryset.order_by('-date_time', '-id'), INTERVIEW_COLUMNS, 'interviews', request.GET.get('format', 'csv'))
+
+@query_budget(3)
+@staff_member_required
+def admin_interns_export(request):
+    queryset = filter_interns(Intern.objects.all(), request.GET.get('cv_status'))
+    return export_response(queryset.order_by('-id'), INTERN_COLUMNS, 'interns', request.GET.get('format', 'csv'))